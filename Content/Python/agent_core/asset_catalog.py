@@ -0,0 +1,619 @@
+"""Indexed project asset catalog with prefix and fuzzy lookup.
+
+The catalog bulk-scans an asset registry into a persisted JSON index of asset paths, names,
+tags and bounds, and answers name queries without touching the editor:
+
+- exact alias / asset name ("house_small", "SM_House_Small")
+- token-set match, order-insensitive ("small house" -> SM_House_Small)
+- token-prefix match through a trie over the name vocabulary ("sm hou")
+- trigram fuzzy match for typos ("blaksmith"); every query word must closely match a word of
+  the asset name, so "large house" does not resolve to SM_House_Small
+
+Registries are adapters with `list_assets()` returning record dicts. `UnrealAssetRegistry`
+reads the editor's asset registry (imports `unreal` lazily); `MockAssetRegistry` is an
+in-memory registry for tests that also pushes change events to subscribers.
+"""
+
+import gc
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Asset classes the spawn skills can place (they create a StaticMeshActor and set its mesh)
+SPAWNABLE_CLASSES = ("StaticMesh",)
+
+INDEX_VERSION = 2  # v2 also stores the derived token / trigram indexes; v1 files are rebuilt on load
+
+# Common UE naming-convention prefixes that carry no meaning for lookup
+_TYPE_PREFIXES = {"sm", "sk", "bp", "abp", "wbp", "t", "m", "mi", "s", "p", "pp"}
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+_SPLIT = re.compile(r"[^0-9A-Za-z一-鿿]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split on separators and camelCase, lowercase: 'SM_HouseSmall' -> ['sm', 'house', 'small']."""
+    text = _CAMEL.sub(r"\1 \2", str(text))
+    return [t.lower() for t in _SPLIT.split(text) if t]
+
+
+def name_tokens(name: str) -> List[str]:
+    """Tokens of an asset name without its type prefix: 'SM_House_Small' -> ['house', 'small']."""
+    tokens = tokenize(name)
+    if len(tokens) > 1 and tokens[0] in _TYPE_PREFIXES:
+        tokens = tokens[1:]
+    return tokens
+
+
+def _trigrams(tokens: Iterable[str]) -> set:
+    text = f" {' '.join(tokens)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _dice(a: set, b: set) -> float:
+    return 2.0 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def make_record(path: str, name: Optional[str] = None, tags: Optional[List[str]] = None,
+                bounds: Optional[List[float]] = None, asset_class: str = "") -> Dict[str, Any]:
+    """Normalized catalog record. `name` defaults to the last path segment."""
+    if name is None:
+        name = path.rstrip("/").rsplit("/", 1)[-1].split(".", 1)[0]
+    return {"path": path, "name": name, "tags": list(tags or []), "bounds": bounds, "class": asset_class}
+
+
+@contextmanager
+def _gc_paused():
+    """Bulk index builds allocate millions of small containers; cyclic GC passes over them dominate."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class PrefixTrie:
+    """Trie over words; `words(prefix)` returns the vocabulary entries starting with prefix."""
+
+    _END = "\0"
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def insert(self, word: str):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[self._END] = True
+
+    def words(self, prefix: str, limit: int = 256) -> List[str]:
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        out, stack = [], [(node, prefix)]
+        while stack and len(out) < limit:
+            node, word = stack.pop()
+            for ch, child in node.items():
+                if ch == self._END:
+                    out.append(word)
+                else:
+                    stack.append((child, word + ch))
+        return out
+
+
+class AssetCatalog:
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}  # asset path -> record
+        self.aliases: Dict[str, str] = {}  # lowercase alias / name -> asset path
+        self._aliases_by_path: Dict[str, set] = {}
+        self._name_tokens: Dict[str, tuple] = {}
+        self._by_tokenset: Dict[frozenset, set] = {}
+        self._token_index: Dict[str, set] = {}
+        self._trigram_index: Dict[str, set] = {}
+        self._trigram_counts: Dict[str, int] = {}
+        self._trie = PrefixTrie()
+        self._sorted_postings: Dict[str, List[str]] = {}  # token -> paths in rank order, built on demand
+        self._lock = threading.RLock()
+        # Work caps that keep prefix / fuzzy lookups bounded on very large projects
+        self.max_scan = 4096
+        self.max_gram_postings = 1000
+        # Source registry for refresh-on-miss (see attach)
+        self._registry = None
+        self.refresh_interval = 5.0
+        self._last_refresh = 0.0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, path):
+        return path in self.records
+
+    # ---- building the index ----------------------------------------------------------------
+
+    def add_asset(self, record: Dict[str, Any]):
+        with self._lock:
+            path = record["path"]
+            kept_aliases = set()
+            if path in self.records:
+                # Re-index an updated record but keep aliases that point at it
+                kept_aliases = set(self._aliases_by_path.get(path, ()))
+                self.remove_asset(path)
+            self.records[path] = record
+            for alias in kept_aliases:
+                self._set_alias(alias, path)
+
+            tokens = tuple(name_tokens(record["name"]))
+            self._name_tokens[path] = tokens
+            keys = set(tokens)
+            for tag in record.get("tags") or []:
+                keys.update(tokenize(tag))
+            for token in keys:
+                if token not in self._token_index:
+                    self._token_index[token] = set()
+                    self._trie.insert(token)
+                self._token_index[token].add(path)
+                self._sorted_postings.pop(token, None)
+
+            self._by_tokenset.setdefault(frozenset(tokens), set()).add(path)
+            self._set_alias(record["name"].lower(), path, overwrite=False)
+
+            grams = _trigrams(tokens)
+            self._trigram_counts[path] = len(grams)
+            for g in grams:
+                self._trigram_index.setdefault(g, set()).add(path)
+
+    def remove_asset(self, path: str):
+        with self._lock:
+            record = self.records.pop(path, None)
+            if record is None:
+                return
+            tokens = self._name_tokens.pop(path)
+            keys = set(tokens)
+            for tag in record.get("tags") or []:
+                keys.update(tokenize(tag))
+            for token in keys:
+                self._token_index.get(token, set()).discard(path)
+                self._sorted_postings.pop(token, None)
+            self._by_tokenset.get(frozenset(tokens), set()).discard(path)
+            for g in _trigrams(tokens):
+                self._trigram_index.get(g, set()).discard(path)
+            self._trigram_counts.pop(path, None)
+            for alias in self._aliases_by_path.pop(path, ()):
+                if self.aliases.get(alias) == path:
+                    del self.aliases[alias]
+
+    def _set_alias(self, alias: str, path: str, overwrite: bool = True):
+        if not overwrite and alias in self.aliases:
+            return
+        previous = self.aliases.get(alias)
+        if previous is not None:
+            self._aliases_by_path.get(previous, set()).discard(alias)
+        self.aliases[alias] = path
+        self._aliases_by_path.setdefault(path, set()).add(alias)
+
+    def add_alias(self, alias: str, asset_path: str):
+        """Map a catalog key such as 'house_small' to an asset, adding the asset if unknown."""
+        with self._lock:
+            if asset_path not in self.records:
+                self.add_asset(make_record(asset_path))
+            self._set_alias(alias.lower(), asset_path)
+
+    def seed_from_config(self, config: Dict[str, Dict[str, Any]]):
+        """Register `{key: {"asset_path": ...}}` entries (config.json / assets_config.json catalog)."""
+        for key, info in config.items():
+            if isinstance(info, dict) and info.get("asset_path"):
+                self.add_alias(key, info["asset_path"])
+
+    def scan(self, registry) -> int:
+        """Bulk-load every asset from `registry`; returns the number of records."""
+        with self._lock, _gc_paused():
+            for record in registry.list_assets():
+                self.add_asset(record)
+            return len(self.records)
+
+    def refresh(self, registry) -> Dict[str, int]:
+        """Incrementally sync with `registry`: only added, removed or changed assets are re-indexed."""
+        current = {r["path"]: r for r in registry.list_assets()}
+        stats = {"added": 0, "removed": 0, "updated": 0}
+        with self._lock:
+            for path in [p for p in self.records if p not in current]:
+                self.remove_asset(path)
+                stats["removed"] += 1
+            for path, record in current.items():
+                old = self.records.get(path)
+                if old is None:
+                    stats["added"] += 1
+                elif old != record:
+                    stats["updated"] += 1
+                else:
+                    continue
+                self.add_asset(record)
+        return stats
+
+    def attach(self, registry, refresh_interval: float = 5.0):
+        """Keep the catalog in sync with `registry` without a tick.
+
+        Registries that push events are watched; for the rest a `resolve()` miss triggers an
+        incremental `refresh()`, at most once per `refresh_interval` seconds, so assets imported
+        during the session become visible on the first request that names them.
+        """
+        self._registry = registry
+        self.refresh_interval = refresh_interval
+        self._last_refresh = time.monotonic()
+        try:
+            self.watch(registry)
+        except NotImplementedError:
+            pass
+
+    def watch(self, registry):
+        """Apply registry change events (added / removed / renamed) as they happen."""
+        registry.subscribe(self._on_registry_event)
+
+    def _on_registry_event(self, event: str, payload):
+        if event in ("added", "updated"):
+            self.add_asset(payload)
+        elif event == "removed":
+            self.remove_asset(payload)
+        elif event == "renamed":
+            old_path, record = payload
+            self.remove_asset(old_path)
+            self.add_asset(record)
+
+    # ---- persistence -------------------------------------------------------------------------
+
+    def save(self, index_path: str):
+        """Write records, aliases and the derived indexes (asset paths stored as list positions)."""
+        with self._lock, _gc_paused():
+            paths = list(self.records)
+            ids = {path: i for i, path in enumerate(paths)}
+            data = {
+                "version": INDEX_VERSION,
+                "assets": [self.records[p] for p in paths],
+                "aliases": self.aliases,
+                "name_tokens": [self._name_tokens[p] for p in paths],
+                "trigram_counts": [self._trigram_counts[p] for p in paths],
+                "tokens": {t: [ids[p] for p in ps] for t, ps in self._token_index.items() if ps},
+                "trigrams": {g: [ids[p] for p in ps] for g, ps in self._trigram_index.items() if ps},
+                "trie": self._trie.root,
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False))  # one-shot C encoder; json.dump streams chunks slowly
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def load(cls, index_path: str) -> "AssetCatalog":
+        catalog = cls()
+        with _gc_paused():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            version = data.get("version")
+            if version == INDEX_VERSION:
+                catalog._restore_indexes(data)
+            elif version == 1:
+                for record in data.get("assets", []):
+                    catalog.add_asset(record)
+                for alias, path in data.get("aliases", {}).items():
+                    if path in catalog.records:
+                        catalog._set_alias(alias, path)
+            else:
+                raise ValueError(f"Unsupported asset index version: {version}")
+        return catalog
+
+    def _restore_indexes(self, data: Dict[str, Any]):
+        """Adopt the persisted derived indexes instead of re-tokenizing every record."""
+        assets = data["assets"]
+        paths = [record["path"] for record in assets]
+        self.records = dict(zip(paths, assets))
+        self._name_tokens = {path: tuple(tokens) for path, tokens in zip(paths, data["name_tokens"])}
+        self._trigram_counts = dict(zip(paths, data["trigram_counts"]))
+        by_tokenset = self._by_tokenset
+        for path, tokens in self._name_tokens.items():
+            key = frozenset(tokens)
+            if key in by_tokenset:
+                by_tokenset[key].add(path)
+            else:
+                by_tokenset[key] = {path}
+        self._token_index = {token: set(map(paths.__getitem__, ids)) for token, ids in data["tokens"].items()}
+        self._trigram_index = {gram: set(map(paths.__getitem__, ids)) for gram, ids in data["trigrams"].items()}
+        self._trie.root = data["trie"]
+        self._sorted_postings = {}
+        # Aliases are persisted, including the lowercase asset names
+        self.aliases = {alias: path for alias, path in data["aliases"].items() if path in self.records}
+        for alias, path in self.aliases.items():
+            self._aliases_by_path.setdefault(path, set()).add(alias)
+
+    # ---- lookup ------------------------------------------------------------------------------
+
+    def resolve(self, query: str, classes: Optional[Iterable[str]] = None,
+                refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """Best matching record for `query`, or None.
+
+        `classes` restricts the asset class (records without a class, e.g. config seeds, always
+        match). A miss refreshes an attached registry once per `refresh_interval` and retries;
+        speculative callers (prefetch) pass `refresh=False` so a registry scan never runs on
+        their thread.
+        """
+        hits = self.lookup(query, limit=1, classes=classes)
+        if not hits and refresh and self._registry is not None:
+            now = time.monotonic()
+            if now - self._last_refresh >= self.refresh_interval:
+                self._last_refresh = now
+                self.refresh(self._registry)
+                hits = self.lookup(query, limit=1, classes=classes)
+        return hits[0] if hits else None
+
+    def lookup(self, query: str, limit: int = 5, min_score: float = 0.5, min_token_score: float = 0.5,
+               classes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Ranked records for `query`: alias/name, token set, token prefixes, then trigrams.
+
+        With `classes`, only records of those asset classes (or without a class) are returned.
+        """
+        with self._lock:
+            allowed = self._class_filter(classes)
+            key = query.strip().lower()
+            path = self.aliases.get(key)
+            if path in self.records and allowed(path):
+                return [self.records[path]]
+
+            tokens = name_tokens(query)
+            if not tokens:
+                return []
+
+            paths = [p for p in self._by_tokenset.get(frozenset(tokens), ()) if allowed(p)]
+            if paths:
+                return self._rank(paths, tokens, limit)
+
+            candidates = self._prefix_matches(tokens, limit, allowed)
+            if candidates:
+                return self._rank(candidates, tokens, limit)
+
+            return self._fuzzy(tokens, limit, min_score, min_token_score, allowed)
+
+    def _order_key(self, path):
+        return len(self._name_tokens[path]), len(path), path
+
+    def _postings(self, word) -> List[str]:
+        postings = self._sorted_postings.get(word)
+        if postings is None:
+            name_tokens = self._name_tokens
+            postings = sorted(self._token_index.get(word, ()), key=lambda p: (len(name_tokens[p]), len(p), p))
+            self._sorted_postings[word] = postings
+        return postings
+
+    def _prefix_matches(self, tokens, limit, allowed) -> List[str]:
+        """Paths where every query token matches a word prefix, without building full candidate sets.
+
+        The rarest query token drives the scan: its postings are walked in rank order (fewest
+        name tokens, then shortest path) and checked against the other tokens by set
+        membership. Once `limit` matches with at least as many name tokens as the query are
+        found, nothing later can rank higher, so the scan stops; it never exceeds `max_scan`.
+        """
+        groups = []
+        for token in set(tokens):
+            words = [w for w in self._trie.words(token) if self._token_index.get(w)]
+            if not words:
+                return []
+            groups.append((sum(len(self._token_index[w]) for w in words), words))
+        groups.sort(key=lambda g: g[0])
+        driver = groups[0][1]
+        filters = [[self._token_index[w] for w in words] for _, words in groups[1:]]
+
+        if len(driver) == 1:
+            stream = iter(self._postings(driver[0]))
+        else:
+            stream = heapq.merge(*(self._postings(w) for w in driver), key=self._order_key)
+        query_len = len(tokens)
+        found, complete, seen = [], 0, set()
+        for scanned, path in enumerate(stream):
+            if scanned >= self.max_scan or complete >= limit:
+                break
+            if path in seen:
+                continue
+            seen.add(path)
+            if not allowed(path) or not all(any(path in ps for ps in sets) for sets in filters):
+                continue
+            found.append(path)
+            if len(self._name_tokens[path]) >= query_len:
+                complete += 1
+        return found
+
+    def _class_filter(self, classes):
+        if not classes:
+            return lambda path: True
+        classes = set(classes)
+        return lambda path: self.records[path].get("class") in classes or not self.records[path].get("class")
+
+    def _rank(self, paths, tokens, limit):
+        # Fewest extra name tokens first, then shortest path
+        def key(path):
+            return (abs(len(self._name_tokens[path]) - len(tokens)), len(path), path)
+        return [self.records[p] for p in heapq.nsmallest(limit, paths, key=key)]
+
+    def _fuzzy(self, tokens, limit, min_score, min_token_score, allowed):
+        grams = _trigrams(tokens)
+        counts = Counter()
+        # Rarest trigrams first; very common ones carry little signal and would touch most of
+        # the catalog, so they are skipped (scores are then a lower bound)
+        for g in sorted(grams, key=lambda g: len(self._trigram_index.get(g, ()))):
+            postings = self._trigram_index.get(g, ())
+            if len(postings) > self.max_gram_postings:
+                break
+            counts.update(postings)
+        scored = []
+        for path, common in counts.items():
+            score = 2.0 * common / (len(grams) + self._trigram_counts[path])
+            if score >= min_score:
+                scored.append((-score, len(path), path))
+        scored.sort()
+
+        # Overall similarity is not enough ("large house" shares "house" with SM_House_Small):
+        # every query word must itself be close to one of the asset's name words
+        query_grams = [_trigrams([t]) for t in tokens]
+        out = []
+        for _, _, path in scored:
+            if not allowed(path):
+                continue
+            name_grams = [_trigrams([t]) for t in self._name_tokens[path]]
+            if all(any(_dice(q, n) >= min_token_score for n in name_grams) for q in query_grams):
+                out.append(self.records[path])
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class MockAssetRegistry:
+    """In-memory asset registry for tests; notifies subscribers on every change."""
+
+    def __init__(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Callable[[str, Any], None]] = []
+        for r in records or []:
+            self._records[r["path"]] = r
+
+    def list_assets(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def subscribe(self, callback: Callable[[str, Any], None]):
+        self._listeners.append(callback)
+
+    def add(self, record: Dict[str, Any]):
+        event = "updated" if record["path"] in self._records else "added"
+        self._records[record["path"]] = record
+        self._emit(event, record)
+
+    def remove(self, path: str):
+        if self._records.pop(path, None) is not None:
+            self._emit("removed", path)
+
+    def rename(self, old_path: str, new_path: str, new_name: Optional[str] = None):
+        record = dict(self._records.pop(old_path))
+        record["path"] = new_path
+        record["name"] = new_name or make_record(new_path)["name"]
+        self._records[new_path] = record
+        self._emit("renamed", (old_path, record))
+
+    def _emit(self, event, payload):
+        for cb in self._listeners:
+            cb(event, payload)
+
+
+class UnrealAssetRegistry:
+    """Adapter over the editor's asset registry. Only reads AssetData; nothing is loaded."""
+
+    def __init__(self, root_path: str = "/Game", class_names: Optional[List[str]] = None):
+        self.root_path = root_path
+        # Only classes the spawn skills can place; pass class_names to index more
+        self.class_names = set(class_names or SPAWNABLE_CLASSES)
+
+    def list_assets(self) -> List[Dict[str, Any]]:
+        from agent_core.ue_bridge import get_unreal
+
+        registry = get_unreal().AssetRegistryHelpers.get_asset_registry()
+        out = []
+        for data in registry.get_assets_by_path(self.root_path, recursive=True):
+            asset_class = str(data.asset_class_path.asset_name)
+            if self.class_names and asset_class not in self.class_names:
+                continue
+            package = str(data.package_name)
+            folder = package.rsplit("/", 1)[0]
+            bounds = None
+            approx = data.get_tag_value("ApproxSize")
+            if approx:
+                try:
+                    bounds = [float(v) for v in str(approx).split("x")]
+                except ValueError:
+                    bounds = None
+            out.append(make_record(
+                package,
+                name=str(data.asset_name),
+                tags=[t for t in folder.split("/") if t and t != "Game"],
+                bounds=bounds,
+                asset_class=asset_class,
+            ))
+        return out
+
+    def subscribe(self, callback):
+        # The Python API exposes no registry delegates; callers use refresh() instead
+        raise NotImplementedError("UnrealAssetRegistry does not push events; use AssetCatalog.refresh()")
+
+
+def default_index_path() -> str:
+    """`AGENTCRAFT_ASSET_INDEX` or `<Project>/Saved/AgentCraft/asset_index.json`."""
+    env = os.environ.get("AGENTCRAFT_ASSET_INDEX")
+    if env:
+        return env
+    project_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return os.path.join(project_dir, "Saved", "AgentCraft", "asset_index.json")
+
+
+_project_catalog: Optional[AssetCatalog] = None
+_project_seeds: List[Dict[str, Dict[str, Any]]] = []
+_project_lock = threading.Lock()
+
+
+def register_seed(config: Dict[str, Dict[str, Any]]):
+    """Add `{key: {"asset_path": ...}}` entries as aliases of the project catalog.
+
+    Cheap to call at skill load time: seeds are applied when the catalog is first built.
+    """
+    with _project_lock:
+        if config in _project_seeds:
+            return
+        _project_seeds.append(config)
+        catalog = _project_catalog
+    if catalog is not None:
+        catalog.seed_from_config(config)
+
+
+def get_project_catalog(registry=None, index_path: Optional[str] = None) -> AssetCatalog:
+    """Process-wide catalog: loaded from the persisted index, else scanned from `registry`.
+
+    Inside the editor the registry defaults to `UnrealAssetRegistry`; outside it the catalog
+    starts empty and is filled by `seed_from_config`.
+    """
+    global _project_catalog
+    with _project_lock:
+        if _project_catalog is not None:
+            return _project_catalog
+
+        index_path = index_path or default_index_path()
+        catalog = None
+        if os.path.exists(index_path):
+            try:
+                catalog = AssetCatalog.load(index_path)
+            except Exception as e:
+                print(f"⚠️ 资产索引无法读取，将重新扫描: {e}")
+
+        if registry is None:
+            from agent_core.ue_bridge import get_unreal
+            registry = UnrealAssetRegistry() if get_unreal() is not None else None
+
+        if registry is not None:
+            if catalog is None:
+                catalog = AssetCatalog()
+                catalog.scan(registry)
+            else:
+                catalog.refresh(registry)
+            try:
+                catalog.save(index_path)
+            except OSError as e:
+                print(f"⚠️ 无法保存资产索引: {e}")
+
+        catalog = catalog or AssetCatalog()
+        if registry is not None:
+            catalog.attach(registry)
+        for config in _project_seeds:
+            catalog.seed_from_config(config)
+        _project_catalog = catalog
+        return _project_catalog
@@ -0,0 +1,163 @@
+"""Idempotent tool execution: duplicate-call suppression and memoization of pure tools.
+
+Every call gets an idempotency key derived from (tool, normalized args, session). A call
+whose key was executed successfully within `dedupe_window` seconds is not run again; the
+earlier result is returned instead, so a repeated LLM tool call or a re-sent instruction
+does not spawn a second building. Tools marked `"pure": true` in `tool_def.json` have their
+results memoized (session-independent) in a bounded LRU.
+
+Calls that overlap (e.g. `SkillManager.execute_tool` from two threads) are covered too: the
+key is marked in flight before the tool runs, and identical calls wait for its result.
+
+Error results (`{"status": "error"}` dicts, "Error: ..." strings, raised exceptions) are
+never recorded, so a retry after a failure always runs.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def normalize_args(value):
+    """Canonical form of tool arguments: sorted keys, lists for tuples, 1.0 == 1, rounded floats."""
+    if isinstance(value, dict):
+        return {str(k): normalize_args(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize_args(v) for v in value]
+    if isinstance(value, float):
+        value = round(value, 6)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def idempotency_key(tool_name: str, args: Dict[str, Any], session_id: Optional[str] = None) -> str:
+    payload = json.dumps([tool_name, normalize_args(args or {}), session_id], sort_keys=True,
+                         separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def is_error_result(result) -> bool:
+    """Error dicts (`{"status": "error"}`) and "Error: ..." strings returned by tools."""
+    if isinstance(result, dict):
+        return result.get("status") == "error"
+    if isinstance(result, str):
+        return result.startswith("Error")
+    return False
+
+
+class _InFlight:
+    """A call that is still running; identical calls wait on it instead of executing again."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.ok = False
+
+
+class ToolCallGuard:
+    def __init__(self, dedupe_window: float = 5.0, memo_size: int = 128, max_recent: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.dedupe_window = dedupe_window
+        self.memo_size = memo_size
+        self.max_recent = max_recent
+        self.clock = clock
+        self._recent: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (executed_at, result)
+        self._memo: "OrderedDict[str, Any]" = OrderedDict()  # key -> result (pure tools, LRU)
+        self._inflight: Dict[str, _InFlight] = {}  # key -> call still running
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executed": 0, "duplicates_suppressed": 0, "cache_hits": 0, "cache_misses": 0}
+
+    def execute(self, tool_name: str, args: Dict[str, Any], fn: Callable[[], Any],
+                session_id: Optional[str] = None, pure: bool = False):
+        """Run `fn()` unless an identical call was just executed (or is memoized for pure tools).
+
+        An identical call that is still running is waited for and its result returned; if it
+        fails, one of the waiters runs the call instead.
+        """
+        return self.call(tool_name, args, fn, session_id=session_id, pure=pure)[0]
+
+    def call(self, tool_name: str, args: Dict[str, Any], fn: Callable[[], Any],
+             session_id: Optional[str] = None, pure: bool = False) -> Tuple[Any, bool]:
+        """Like `execute`, but returns `(result, duplicate)`.
+
+        `duplicate` is True when the call was suppressed as a repeat of an earlier (or running)
+        identical call, so callers can avoid recording it as a second action. Memo hits of pure
+        tools are not duplicates.
+        """
+        key = idempotency_key(tool_name, args) if pure else idempotency_key(tool_name, args, session_id)
+        hit = "cache_hits" if pure else "duplicates_suppressed"
+        dedupe = pure or self.dedupe_window > 0
+        with self._lock:
+            self.stats["calls"] += 1
+
+        while True:
+            with self._lock:
+                if pure:
+                    if key in self._memo:
+                        self._memo.move_to_end(key)
+                        self.stats[hit] += 1
+                        return self._memo[key], False
+                elif dedupe:
+                    self._expire(self.clock())
+                    if key in self._recent:
+                        self.stats[hit] += 1
+                        return self._recent[key][1], True
+                pending = self._inflight.get(key) if dedupe else None
+                if pending is None:
+                    if pure:
+                        self.stats["cache_misses"] += 1
+                    if dedupe:
+                        pending = self._inflight[key] = _InFlight()
+                    break
+            pending.done.wait()
+            if pending.ok:
+                with self._lock:
+                    self.stats[hit] += 1
+                return pending.result, not pure
+            # The running call failed: check again, and run it if nobody else does
+
+        try:
+            result = fn()
+        except BaseException:
+            self._finish(key, pending, None, ok=False)
+            raise
+
+        with self._lock:
+            self.stats["executed"] += 1
+            ok = not is_error_result(result)
+            if ok and pure:
+                self._memo[key] = result
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+            elif ok and dedupe:
+                self._recent[key] = (self.clock(), result)
+                while len(self._recent) > self.max_recent:
+                    self._recent.popitem(last=False)
+        self._finish(key, pending, result, ok)
+        return result, False
+
+    def _finish(self, key, pending, result, ok):
+        if pending is None:
+            return
+        with self._lock:
+            self._inflight.pop(key, None)
+        pending.result, pending.ok = result, ok
+        pending.done.set()
+
+    def _expire(self, now: float):
+        # Entries are in execution order, so expired ones are at the front
+        while self._recent:
+            executed_at = next(iter(self._recent.values()))[0]
+            if now - executed_at < self.dedupe_window:
+                break
+            self._recent.popitem(last=False)
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._memo.clear()
@@ -0,0 +1,114 @@
+"""Import-time profiler for agent_core modules and skills.
+
+Usage (from Content/Python):
+    python -m agent_core.import_profiler
+    python -m agent_core.import_profiler agent_core.llm skills.medieval_builder.skill --budget-ms 100
+
+Each module is imported in a fresh interpreter with `python -X importtime`, so the numbers
+are cold-import costs including everything the module pulls in. Interpreter startup
+(site, encodings, ...) is excluded. Exits with status 1 if a module exceeds `--budget-ms`.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("openai", "requests", "pydantic", "unreal")
+_MARKER = "--agent-import-profile--"
+
+
+def discover_targets(root: str = ROOT) -> List[str]:
+    """All agent_core modules plus every skills/<name>/skill.py."""
+    targets = []
+    core_dir = os.path.join(root, "agent_core")
+    for fname in sorted(os.listdir(core_dir)):
+        if fname.endswith(".py") and fname not in ("__init__.py", "import_profiler.py"):
+            targets.append(f"agent_core.{fname[:-3]}")
+    skills_dir = os.path.join(root, "skills")
+    for folder in sorted(os.listdir(skills_dir)):
+        if os.path.exists(os.path.join(skills_dir, folder, "skill.py")):
+            targets.append(f"skills.{folder}.skill")
+    return targets
+
+
+def profile_module(module: str, root: str = ROOT, python: str = sys.executable) -> Dict[str, object]:
+    """Import `module` in a subprocess and return its cumulative import cost.
+
+    Result keys: module, cumulative_us, heaviest (top direct dependencies as (name, us)),
+    heavy_loaded (which of HEAVY_MODULES ended up imported), error.
+    """
+    code = (
+        "import sys\n"
+        f"sys.stderr.write({_MARKER!r} + '\\n')\n"
+        f"import {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if sys.modules.get(m) is not None))\n"
+    )
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], cwd=root, capture_output=True, text=True)
+    lines = proc.stderr.splitlines()
+    if _MARKER in lines:
+        lines = lines[lines.index(_MARKER) + 1:]
+
+    total = 0
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            cumulative_us = int(cumulative.strip())
+        except ValueError:
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            total += cumulative_us
+        elif depth == 1:
+            entries.append((name, cumulative_us))
+
+    entries.sort(key=lambda e: e[1], reverse=True)
+    heavy = proc.stdout.strip().splitlines()[-1] if proc.returncode == 0 and proc.stdout.strip() else ""
+    return {
+        "module": module,
+        "cumulative_us": total,
+        "heaviest": entries[:3],
+        "heavy_loaded": [m for m in heavy.split(",") if m],
+        "error": None if proc.returncode == 0 else (proc.stderr.strip().splitlines() or ["import failed"])[-1],
+    }
+
+
+def format_report(results: List[Dict[str, object]]) -> str:
+    rows = [f"{'module':<40} {'cumulative_ms':>13}  heaviest dependencies"]
+    for r in sorted(results, key=lambda r: r["cumulative_us"], reverse=True):
+        if r["error"]:
+            rows.append(f"{r['module']:<40} {'ERROR':>13}  {r['error']}")
+            continue
+        deps = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in r["heaviest"])
+        if r["heavy_loaded"]:
+            deps += f"  [loads: {', '.join(r['heavy_loaded'])}]"
+        rows.append(f"{r['module']:<40} {r['cumulative_us'] / 1000:>13.1f}  {deps}")
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report cold import cost of agent_core modules and skills.")
+    parser.add_argument("modules", nargs="*", help="modules to profile (default: all agent_core modules and skills)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if any module exceeds this cumulative import time")
+    args = parser.parse_args(argv)
+
+    results = [profile_module(m) for m in (args.modules or discover_targets())]
+    print(format_report(results))
+
+    failed = [r for r in results if r["error"]]
+    if args.budget_ms is not None:
+        failed += [r for r in results if not r["error"] and r["cumulative_us"] > args.budget_ms * 1000]
+    if failed:
+        print(f"\n❌ {len(failed)} module(s) failed or exceeded the budget: {', '.join(r['module'] for r in failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,15 @@
 
 This client prefers using the OpenAI-compatible Python SDK (`from openai import OpenAI`) if
 it is installed and available, because DeepSeek exposes an OpenAI-compatible interface.
-If the SDK is not available, a requests-based fallback is used.
+If the SDK is not available, a requests-based fallback is used. Both are imported when the
+first client is created, not when this module is imported.
 
 Environment variables supported:
 - DEEPSEEK_API_KEY: API key (required)
 - DEEPSEEK_API_URL or DEEPSEEK_BASE_URL: Base URL for DeepSeek (e.g. https://api.deepseek.com)
 - DEEPSEEK_MODEL: Model name (default: deepseek-chat)
+- DEEPSEEK_API_URLS: Optional comma-separated list of base URLs; requests go to the
+  fastest healthy one and hedges/retries spill over to the others
 
 Note: do NOT commit API keys in source control. Set them in your environment or a secure
 secrets store. Example (PowerShell):
@@ -15,29 +18,47 @@ secrets store. Example (PowerShell):
     $env:DEEPSEEK_API_URL = "https://api.deepseek.com"
 """
 
+import importlib
 import os
 import json
-from typing import Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
 
-# Prefer OpenAI SDK if present (DeepSeek is OpenAI-compatible)
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from agent_core.resilience import CircuitBreaker, CircuitOpenError, Endpoint, backoff_delay, is_retryable
 
-# Fallback HTTP client
-try:
-    import requests
-except Exception:
-    requests = None
+
+def _import_optional(name: str):
+    """Import a heavy optional dependency on first use; None when unavailable."""
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
 
 
 DEFAULT_BASE_URL = os.environ.get("DEEPSEEK_API_URL") or os.environ.get("DEEPSEEK_BASE_URL") or "https://api.deepseek.com"
 DEFAULT_MODEL = os.environ.get("DEEPSEEK_MODEL", "deepseek-chat")
 
 
+class _StreamAbandoned(Exception):
+    """Raised inside a hedged stream that lost the race; stops it without counting a failure."""
+
+
 class DeepseekClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None, timeout: int = 15):
+    """DeepSeek chat client with retries, hedged requests and a per-endpoint circuit breaker.
+
+    Every (base URL, model) pair is an `Endpoint`. Each attempt goes to the healthy endpoint
+    with the lowest observed latency; if it has not answered by its p95 latency (for
+    streams: p95 time to the first fragment; `hedge_delay` until enough samples exist) a
+    duplicate request is sent to the next endpoint and the first success wins. Failed attempts are retried with jittered
+    exponential backoff; when every breaker is open the call fails fast with
+    `CircuitOpenError`.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None, timeout: int = 15,
+                 base_urls: Optional[List[str]] = None, models: Optional[List[str]] = None, max_retries: int = 2,
+                 backoff_base: float = 0.25, backoff_cap: float = 4.0, hedge: bool = True, hedge_delay: float = 2.0,
+                 hedge_percentile: float = 95.0, hedge_min_samples: int = 5, breaker_threshold: int = 5, breaker_reset: float = 30.0):
         self.api_key = api_key or os.environ.get("DEEPSEEK_API_KEY")
         if not self.api_key:
             raise RuntimeError("DEEPSEEK_API_KEY not set in environment")
@@ -46,15 +67,57 @@ class DeepseekClient:
         self.model = model or os.environ.get("DEEPSEEK_MODEL") or DEFAULT_MODEL
         self.timeout = timeout
 
-        # Initialize preferred client (OpenAI SDK) if available
+        # Retry / hedging policy
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.stats = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "fast_fails": 0}
+
+        # Endpoints: every base URL crossed with every model, primary first
+        if base_urls is None:
+            env_urls = os.environ.get("DEEPSEEK_API_URLS")
+            base_urls = [u.strip() for u in env_urls.split(",") if u.strip()] if env_urls and not base_url else [self.base_url]
+        models = models or [self.model]
+        self.endpoints: List[Endpoint] = [
+            Endpoint(u.rstrip("/"), m, breaker=CircuitBreaker(breaker_threshold, breaker_reset))
+            for u in base_urls for m in models
+        ]
+        self.base_url = self.endpoints[0].base_url
+
+        # Function schemas built from tool_def.json (see register_tools)
+        self.tools: List[Dict[str, Any]] = []
+        # Metrics of the most recent request
+        self.last_usage: Optional[Dict[str, Any]] = None
+        self.last_latency: Optional[float] = None
+
+        # Initialize preferred client (OpenAI SDK) if available, one per base URL.
+        # SDK-level retries are disabled because retries are handled here.
+        OpenAI = getattr(_import_optional("openai"), "OpenAI", None)
+        self._requests = None
         if OpenAI is not None:
-            self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+            self._sdk_clients = {}
+            for ep in self.endpoints:
+                if ep.base_url not in self._sdk_clients:
+                    self._sdk_clients[ep.base_url] = OpenAI(api_key=self.api_key, base_url=ep.base_url, max_retries=0)
+            self.client = self._sdk_clients[self.base_url]
         else:
             self.client = None
-            if requests is None:
+            # Fallback HTTP client
+            self._requests = _import_optional("requests")
+            if self._requests is None:
                 raise RuntimeError("Either `openai` SDK or `requests` library is required but not available in the environment")
 
-    def generate(self, system_prompt: str, user_input: str, max_tokens: int = 1024, temperature: float = 0.2, stream: bool = False) -> str:
+    def register_tools(self, tool_defs) -> List[Dict[str, Any]]:
+        """Convert tool definitions into function schemas once and cache them on the client."""
+        self.tools = build_tool_schemas(tool_defs)
+        return self.tools
+
+    def generate(self, system_prompt: str, user_input: str, max_tokens: int = 1024, temperature: float = 0.2, stream: bool = False,
+                 history: Optional[List[Dict[str, Any]]] = None, on_delta: Optional[Callable[[str], None]] = None) -> str:
         """Send prompt to DeepSeek and return the text response.
 
         Uses OpenAI SDK when available to call the Chat Completions API in a compatible format:
@@ -62,70 +125,427 @@ class DeepseekClient:
             client.chat.completions.create(model=..., messages=[...])
 
         If the SDK is unavailable, uses a direct HTTP POST to `{base_url}/v1/chat/completions`.
+        `history` (e.g. from ConversationSession.messages()) goes between system prompt and input.
+        With `stream=True` or an `on_delta` callback the response is streamed and every text
+        fragment is passed to `on_delta` as it arrives.
         """
         # Build messages in OpenAI chat format
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_input},
-        ]
+        messages = _build_messages(system_prompt, user_input, history)
+
+        if stream and on_delta is None:
+            on_delta = _ignore_delta
+        data = self._chat(messages, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature)
+        content = _field(_first_message(data), "content")
+        if isinstance(content, str):
+            return content.strip()
+
+        # legacy 'text'
+        choices = _field(data, "choices") or []
+        if choices and isinstance(_field(choices[0], "text"), str):
+            return _field(choices[0], "text").strip()
+
+        # Last resort: return the raw response
+        return data if isinstance(data, str) else str(data)
+
+    def generate_tool_calls(self, system_prompt: str, user_input: str, tools: Optional[List[Dict[str, Any]]] = None, max_tokens: int = 1024, temperature: float = 0.2, tool_choice: str = "auto",
+                            history: Optional[List[Dict[str, Any]]] = None, on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Native function-calling request using the OpenAI-compatible `tools` API.
+
+        Returns ``{"content": str | None, "tool_calls": [{"id", "tool", "args"}, ...]}``.
+        Several parallel calls in one response are returned in order. When `on_delta` is
+        given the response is streamed and partial content / tool-call arguments are passed
+        to it as they arrive (e.g. for AssetPrefetcher.feed).
+        """
+        tools = tools if tools is not None else self.tools
+        if not tools:
+            raise RuntimeError("No tools registered; call register_tools() first")
+
+        messages = _build_messages(system_prompt, user_input, history)
+
+        data = self._chat(messages, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, tools=tools, tool_choice=tool_choice)
+        message = _first_message(data)
+        return {
+            "content": _field(message, "content"),
+            "tool_calls": parse_tool_calls(message),
+        }
+
+    def _chat(self, messages: List[Dict[str, Any]], on_delta: Optional[Callable[[str], None]] = None, **params) -> Any:
+        """Run one chat completion with retries and hedging, and record usage/latency.
 
-        if self.client is not None:
-            # Use OpenAI-compatible SDK
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                stream=stream,
-            )
-            # Response shape: resp.choices[0].message.content
+        Returns the SDK response object or the decoded JSON body. Streamed requests
+        (`on_delta` given) are hedged up to their first fragment and are only retried before it.
+        """
+        start = time.perf_counter()
+        self.stats["requests"] += 1
+        last_error: Optional[Exception] = None
+        emitted = []
+        failed = set()  # endpoints that failed during this call; retries try the others first
+        if on_delta is not None:
+            user_callback = on_delta
+
+            def on_delta(text):
+                emitted.append(True)
+                user_callback(text)
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                time.sleep(backoff_delay(attempt - 1, self.backoff_base, self.backoff_cap))
+            candidates = self._select_endpoints()
+            if not candidates:
+                self.stats["fast_fails"] += 1
+                raise CircuitOpenError("All LLM endpoints are unhealthy (circuit open)") from last_error
+            candidates.sort(key=lambda ep: ep in failed)
+            try:
+                if on_delta is not None:
+                    data = self._hedged_stream(candidates, messages, params, on_delta, failed)
+                else:
+                    data = self._hedged_send(candidates, messages, params, failed)
+                break
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e) or emitted:
+                    raise
+        else:
+            raise last_error
+
+        self.last_latency = time.perf_counter() - start
+        usage = _field(data, "usage")
+        if usage is not None and not isinstance(usage, dict):
+            usage = {k: _field(usage, k) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+        self.last_usage = usage
+        return data
+
+    def _select_endpoints(self) -> List[Endpoint]:
+        """Healthy endpoints, fastest first (untried endpoints sort first)."""
+        healthy = [ep for ep in self.endpoints if ep.breaker.allow()]
+        return sorted(healthy, key=lambda ep: ep.score())
+
+    def _hedge_deadline(self, endpoint: Endpoint, stream: bool = False) -> float:
+        # Only successful attempts are sampled, so timeouts cannot push p95 up to the timeout.
+        # A stream is hedged until its first fragment, so its deadline comes from first-fragment
+        # times; a full response can take many times longer and would delay the hedge
+        tracker = endpoint.first_fragment if stream else endpoint.latency
+        if len(tracker) >= self.hedge_min_samples:
+            return tracker.percentile(self.hedge_percentile)
+        return self.hedge_delay
+
+    def _hedged_send(self, candidates: List[Endpoint], messages, params, failed: Optional[set] = None) -> Any:
+        """Send to the best endpoint; fire a duplicate to the next one if it is slower than p95.
+
+        Endpoints whose attempt failed are added to `failed`.
+        """
+        failed = failed if failed is not None else set()
+        primary = candidates[0]
+        if not self.hedge:
             try:
-                choice = resp.choices[0]
-                # New SDK may return message object
-                if hasattr(choice, 'message') and hasattr(choice.message, 'content'):
-                    return choice.message.content
-                # Fallback shapes
-                if 'text' in choice:
-                    return choice['text']
+                return self._send(primary, messages, params)
             except Exception:
-                # Fallback to stringified resp
-                return str(resp)
-
-        # Fallback: direct HTTP call
-        endpoint = self.base_url
-        # Ensure URL includes /v1 prefix for chat completions
-        if not endpoint.endswith('/v1'):
-            endpoint = endpoint + '/v1'
-        url = endpoint + '/chat/completions'
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "stream": stream,
-        }
+                failed.add(primary)
+                raise
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        futures = {_run_async(self._send, primary, messages, params): primary}
+        done, _ = wait(futures, timeout=self._hedge_deadline(primary))
+        if not done:
+            backup = candidates[1] if len(candidates) > 1 else primary
+            futures[_run_async(self._send, backup, messages, params)] = backup
+            self.stats["hedges"] += 1
+
+        # First success wins; the loser keeps running in the background and only updates stats
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is None:
+                    if len(futures) > 1 and futures[f] is not primary:
+                        self.stats["hedge_wins"] += 1
+                    return f.result()
+                errors.append(f.exception())
+                failed.add(futures[f])
+        raise errors[0]
+
+    def _hedged_stream(self, candidates: List[Endpoint], messages, params, on_delta: Callable[[str], None],
+                       failed: set) -> Any:
+        """Stream from the best endpoint, hedging to the next one until the first fragment arrives.
+
+        Attempts run on the pool and hand fragments over a queue, so `on_delta` (e.g. prefetch
+        loads) runs on the calling thread and is not counted in the endpoint's latency. The first
+        endpoint to emit a fragment wins; the other attempt is abandoned on its next fragment.
+        """
+        import queue
+
+        events = queue.Queue()
+        winner = []
+        lock = threading.Lock()
+
+        def attempt(endpoint):
+            def forward(text):
+                with lock:
+                    if not winner:
+                        winner.append(endpoint)
+                if winner[0] is not endpoint:
+                    raise _StreamAbandoned()
+                events.put(("delta", endpoint, text))
+
+            try:
+                events.put(("done", endpoint, self._send(endpoint, messages, params, forward)))
+            except _StreamAbandoned:
+                pass
+            except Exception as e:
+                events.put(("error", endpoint, e))
+
+        primary = candidates[0]
+        launched = [primary]
+        _run_async(attempt, primary)
+        can_hedge = self.hedge and len(candidates) > 1
+        deadline = time.perf_counter() + self._hedge_deadline(primary, stream=True)
+        errors = []
+        while True:
+            timeout = max(0.0, deadline - time.perf_counter()) if can_hedge and not winner else None
+            try:
+                kind, endpoint, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                # No fragment by the deadline: race a duplicate against the primary
+                launched.append(candidates[1])
+                _run_async(attempt, candidates[1])
+                self.stats["hedges"] += 1
+                can_hedge = False
+                continue
+            if kind == "delta":
+                on_delta(payload)
+            elif kind == "done":
+                if winner and winner[0] is not endpoint:
+                    continue
+                if endpoint is not primary:
+                    self.stats["hedge_wins"] += 1
+                return payload
+            else:
+                failed.add(endpoint)
+                errors.append(payload)
+                # Raise once the stream that already emitted fails, or no attempt is left running
+                # (a primary failing before the deadline is retried by _chat, not hedged)
+                if (winner and winner[0] is endpoint) or len(errors) == len(launched):
+                    raise payload
+
+    def _send(self, endpoint: Endpoint, messages, params, on_delta: Optional[Callable[[str], None]] = None) -> Any:
+        """Single HTTP attempt against one endpoint; updates its latency stats and breaker.
+
+        With `on_delta` the request is streamed and the assembled response is returned as a dict.
+        """
+        if not endpoint.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {endpoint.base_url}")
+
+        start = time.perf_counter()
+        token = endpoint.begin_attempt()
+        if on_delta is not None:
+            on_delta = _timing_first_fragment(on_delta, endpoint.first_fragment, start)
+        try:
+            if self.client is not None:
+                # Use OpenAI-compatible SDK
+                client = self._sdk_clients[endpoint.base_url]
+                if on_delta is not None:
+                    chunks = client.chat.completions.create(model=endpoint.model, messages=messages, timeout=self.timeout,
+                                                            stream=True, stream_options={"include_usage": True}, **params)
+                    data = _consume_stream(chunks, on_delta)
+                else:
+                    data = client.chat.completions.create(model=endpoint.model, messages=messages, timeout=self.timeout, **params)
+            else:
+                # Fallback: direct HTTP call
+                url = endpoint.base_url
+                # Ensure URL includes /v1 prefix for chat completions
+                if not url.endswith('/v1'):
+                    url = url + '/v1'
+                url = url + '/chat/completions'
+
+                payload = {"model": endpoint.model, "messages": messages}
+                payload.update(params)
+                if on_delta is not None:
+                    payload.update(stream=True, stream_options={"include_usage": True})
+
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                }
+
+                extra = {"stream": True} if on_delta is not None else {}
+                resp = self._requests.post(url, headers=headers, json=payload, timeout=self.timeout, **extra)
+                resp.raise_for_status()
+                if on_delta is not None:
+                    data = _consume_stream(_iter_sse(resp), on_delta)
+                else:
+                    try:
+                        data = resp.json()
+                    except ValueError:
+                        data = resp.text
+        except _StreamAbandoned:
+            raise
+        except Exception as e:
+            # Failures are not sampled: a fast 503 must not rank as a fast endpoint, and
+            # timeouts must not inflate the hedge deadline. They count in the breaker instead.
+            # Client errors mean a bad request, not an unhealthy upstream
+            if is_retryable(e):
+                endpoint.breaker.record_failure()
+            raise
+        finally:
+            endpoint.end_attempt(token)
+
+        endpoint.latency.record(time.perf_counter() - start)
+        endpoint.breaker.record_success()
+        return data
+
+
+def _timing_first_fragment(on_delta, tracker, start):
+    """Wrap `on_delta` so the time from `start` to the first fragment is recorded in `tracker`."""
+    pending = [True]
+
+    def wrapped(text):
+        if pending:
+            pending.clear()
+            tracker.record(time.perf_counter() - start)
+        on_delta(text)
+
+    return wrapped
+
+
+def _run_async(fn, *args):
+    """Run `fn(*args)` on its own daemon thread and return a Future for the result.
+
+    Hedged attempts that lose the race keep running until their request ends; a fixed pool
+    would queue new attempts behind them, so every attempt gets a short-lived thread instead.
+    """
+    from concurrent.futures import Future
+
+    future = Future()
+
+    def target():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name="llm-hedge", daemon=True).start()
+    return future
+
+
+def build_tool_schemas(tool_defs) -> List[Dict[str, Any]]:
+    """Convert `tool_def.json` entries to OpenAI-compatible function schemas.
+
+    Accepts either a ``{name: tool_def}`` mapping (SkillRegistry.tool_defs) or a list of
+    tool definitions (SkillManager.definitions). Non-schema keys such as ``examples`` are dropped.
+    """
+    defs = tool_defs.values() if isinstance(tool_defs, dict) else tool_defs
+    schemas = []
+    for t in defs:
+        name = t.get("name")
+        if not name:
+            continue
+        parameters = dict(t.get("parameters") or {})
+        parameters.setdefault("type", "object")
+        parameters.setdefault("properties", {})
+        schemas.append({
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": t.get("description", ""),
+                "parameters": parameters,
+            },
+        })
+    return schemas
+
+
+def parse_tool_calls(message) -> List[Dict[str, Any]]:
+    """Extract structured tool calls from a chat completion message.
+
+    Returns a list of ``{"id", "tool", "args"}`` dicts. Raises ValueError when the
+    arguments of a call are not valid JSON.
+    """
+    calls = []
+    for tc in _field(message, "tool_calls") or []:
+        fn = _field(tc, "function")
+        name = _field(fn, "name")
+        raw_args = _field(fn, "arguments") or "{}"
+        try:
+            args = json.loads(raw_args) if isinstance(raw_args, str) else dict(raw_args)
+        except ValueError as e:
+            raise ValueError(f"Invalid arguments for tool {name}: {e}")
+        calls.append({"id": _field(tc, "id"), "tool": name, "args": args})
+    return calls
+
+
+def _consume_stream(chunks, on_delta: Callable[[str], None]) -> Dict[str, Any]:
+    """Assemble streamed chat completion chunks into a regular response dict.
+
+    Content fragments and tool-call argument fragments are passed to `on_delta` as they
+    arrive; tool calls are merged by their `index`.
+    """
+    content_parts = []
+    calls: Dict[int, Dict[str, Any]] = {}
+    usage = None
+    for chunk in chunks:
+        usage = _field(chunk, "usage") or usage
+        choices = _field(chunk, "choices") or []
+        if not choices:
+            continue
+        delta = _field(choices[0], "delta")
+        text = _field(delta, "content")
+        if text:
+            content_parts.append(text)
+            on_delta(text)
+        for tc in _field(delta, "tool_calls") or []:
+            slot = calls.setdefault(_field(tc, "index") or 0, {"id": None, "function": {"name": "", "arguments": ""}})
+            if _field(tc, "id"):
+                slot["id"] = _field(tc, "id")
+            fn = _field(tc, "function")
+            if _field(fn, "name"):
+                slot["function"]["name"] += _field(fn, "name")
+            if _field(fn, "arguments"):
+                slot["function"]["arguments"] += _field(fn, "arguments")
+                on_delta(_field(fn, "arguments"))
+
+    message = {"role": "assistant", "content": "".join(content_parts) or None}
+    if calls:
+        message["tool_calls"] = [calls[i] for i in sorted(calls)]
+    return {"choices": [{"message": message}], "usage": usage}
+
+
+def _iter_sse(resp):
+    """Decode `data: {...}` server-sent events from a streamed requests response."""
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        yield json.loads(data)
+
+
+def _ignore_delta(text: str):
+    pass
+
+
+def _build_messages(system_prompt: str, user_input: str, history=None) -> List[Dict[str, Any]]:
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(history or [])
+    messages.append({"role": "user", "content": user_input})
+    return messages
+
+
+def _field(obj, name):
+    """Read `name` from either a dict or an SDK response object."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
 
-        resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Extract content from standard OpenAI-compatible response
-        if isinstance(data, dict) and "choices" in data and isinstance(data["choices"], list) and data["choices"]:
-            first = data["choices"][0]
-            # choices[0].message.content
-            if isinstance(first, dict):
-                msg = first.get("message") or first.get("delta") or {}
-                if isinstance(msg, dict) and "content" in msg:
-                    return msg["content"].strip()
-                # legacy 'text'
-                if "text" in first and isinstance(first["text"], str):
-                    return first["text"].strip()
-
-        # Last resort: return raw text
-        return resp.text
+def _first_message(data):
+    """Return choices[0].message (or delta) from a chat completion response."""
+    choices = _field(data, "choices")
+    if not choices:
+        return None
+    first = choices[0]
+    return _field(first, "message") or _field(first, "delta")
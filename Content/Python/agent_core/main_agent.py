@@ -1,9 +1,17 @@
 import json
 import re
 import os
-import unreal
+from agent_core import prefetch
+from agent_core.asset_catalog import SPAWNABLE_CLASSES, get_project_catalog
+from agent_core.idempotency import ToolCallGuard, is_error_result
 from agent_core.skill_loader import SkillRegistry
 from agent_core.llm import DeepseekClient
+from agent_core.prefetch import AssetPrefetcher
+from agent_core.session import SessionStore
+from agent_core.ue_bridge import log, log_error
+
+# 原生 function calling 模式下工具定义通过 `tools` 参数传递，无需把 README / tool_def.json 塞进 prompt
+TOOL_SYSTEM_PROMPT = "你是 UE5 助手。请调用合适的工具完成用户指令，可以一次调用多个工具。"
 
 class UnrealAgent:
     def __init__(self):
@@ -14,33 +22,108 @@ class UnrealAgent:
         # 加载所有技能
         self.registry = SkillRegistry(skills_path)
 
+        # 启动时构建项目资产索引（读取持久化索引或扫描），避免首次查找落在流式输出回调里
+        try:
+            get_project_catalog()
+        except Exception as e:
+            log_error(f"⚠️ 项目资产索引构建失败: {e}")
+
+        # 多轮会话记忆（每个会话独立，总 token 数受预算限制）
+        token_budget = int(os.environ.get("AGENT_SESSION_TOKEN_BUDGET", "2000"))
+        self.sessions = SessionStore(token_budget=token_budget)
+
+        # 流式输出期间预取资产（AGENT_SPECULATIVE_PREFETCH=0 关闭）；累计隐藏的加载延迟
+        self.speculative_prefetch = os.environ.get("AGENT_SPECULATIVE_PREFETCH", "1") != "0"
+        self.prefetch_metrics = {"loaded": 0, "used": 0, "discarded": 0, "dropped": 0, "errors": 0, "hidden_ms": 0.0, "wasted_ms": 0.0}
+
+        # 幂等执行：同一会话内窗口期（秒）内的相同调用只执行一次；tool_def.json 中声明 "pure" 的工具结果做 LRU 缓存
+        dedupe_window = float(os.environ.get("AGENT_TOOL_DEDUPE_WINDOW", "5"))
+        self.tool_guard = ToolCallGuard(dedupe_window=dedupe_window)
+
         # 初始化 LLM 客户端（需要环境变量 DEEPSEEK_API_KEY）
         try:
             self.llm = DeepseekClient()
-            unreal.log("✅ Deepseek LLM client initialized")
+            log("✅ Deepseek LLM client initialized")
+            # 工具定义只转换一次，缓存在客户端上
+            if self.registry.tool_defs:
+                self.llm.register_tools(self.registry.tool_defs)
         except Exception as e:
             self.llm = None
-            unreal.log_error(f"⚠️ LLM 客户端未初始化: {e}")
+            log_error(f"⚠️ LLM 客户端未初始化: {e}")
 
-    def run(self, user_input):
-        unreal.log(f"🧠 Agent 收到指令: {user_input}")
+    def run(self, user_input, session_id="default"):
+        log(f"🧠 Agent 收到指令: {user_input}")
+        session = self.sessions.get(session_id)
 
-        # 1. 构建 System Prompt
-        system_prompt = "你是 UE5 助手。请根据以下工具定义，输出 JSON 指令。\n\n"
-        system_prompt += "\n".join(self.registry.prompts)
+        # 预取只在本轮有效，结束时丢弃未使用的资产
+        prefetcher = AssetPrefetcher(self._resolve_asset_path)
+        with prefetch.activate(prefetcher):
+            self._run_turn(user_input, session, prefetcher.feed if self.speculative_prefetch else None)
+        self._record_prefetch(prefetcher)
 
-        # 2. 调用 LLM（优先使用 Deepseek，失败则回退到本地 Mock）
+    def _run_turn(self, user_input, session, on_delta):
+        history = session.messages()
+
+        # 1. 调用 LLM：优先原生 function calling，其次 prompt + JSON 解析，失败则回退到本地 Mock
+        tool_calls = []
         try:
-            if hasattr(self, 'llm') and self.llm:
-                response = self.llm.generate(system_prompt, user_input)
+            if self.llm and self.llm.tools:
+                result = self.llm.generate_tool_calls(TOOL_SYSTEM_PROMPT, user_input, history=history, on_delta=on_delta)
+                tool_calls = result["tool_calls"]
+                response = result["content"] or ""
+            elif self.llm:
+                response = self.llm.generate(self._build_system_prompt(), user_input, history=history, on_delta=on_delta)
             else:
                 response = self._mock_llm_inference(user_input)
         except Exception as e:
-            unreal.log_error(f"⚠️ LLM 请求失败: {e}")
+            log_error(f"⚠️ LLM 请求失败: {e}")
             response = self._mock_llm_inference(user_input)
 
+        session.add_user(user_input)
+
+        # 2. 结构化调用直接执行（支持一次返回多个并行调用）
+        if tool_calls:
+            for call in tool_calls:
+                result, duplicate = self._dispatch_tool(call["tool"], call["args"], session.session_id)
+                self._record_call(session, call["tool"], call["args"], result, duplicate)
+            return
+
         # 3. 解析并执行
-        self._execute_tool_call(response)
+        call = self._execute_tool_call(response, session.session_id)
+        if call:
+            self._record_call(session, *call)
+        else:
+            session.add_assistant(response)
+
+    def _record_call(self, session, tool_name, args, result, duplicate=False):
+        # 只有成功执行的调用进入会话的结构化状态；被拒绝或失败的调用只记为说明，避免后续指令指向不存在的建筑
+        # 被去重忽略的调用同样只记说明，否则同一座建筑会在会话里出现两次
+        if duplicate:
+            session.add_tool_error(tool_name, args, "重复调用，已忽略")
+        elif is_error_result(result):
+            session.add_tool_error(tool_name, args, result.get("msg", result) if isinstance(result, dict) else result)
+        else:
+            session.add_tool_result(tool_name, args, result)
+
+    def _resolve_asset_path(self, building_type):
+        # 预取是推测性的：未命中时不刷新资产注册表，刷新只发生在真正生成建筑的路径上
+        record = get_project_catalog().resolve(building_type, classes=SPAWNABLE_CLASSES, refresh=False)
+        return record["path"] if record else None
+
+    def _record_prefetch(self, prefetcher):
+        m = prefetcher.metrics()
+        for key in self.prefetch_metrics:
+            self.prefetch_metrics[key] += m[key]
+        if m["used"]:
+            log(f"⚡ 预取隐藏了 {m['hidden_ms']} ms 的资产加载延迟")
+        if m["errors"]:
+            log_error(f"⚠️ 资产预取出错 {m['errors']} 次（已忽略，不影响本次请求）")
+
+    def _build_system_prompt(self):
+        """旧的 prompt 模式：把 README 和 tool_def.json 原文拼进 System Prompt"""
+        system_prompt = "你是 UE5 助手。请根据以下工具定义，输出 JSON 指令。\n\n"
+        system_prompt += "\n".join(self.registry.prompts)
+        return system_prompt
 
     def _mock_llm_inference(self, user_input):
         """模拟大模型根据 README 里的定义返回 JSON"""
@@ -59,7 +142,7 @@ class UnrealAgent:
             """
         return "无法理解指令"
 
-    def _execute_tool_call(self, llm_response):
+    def _execute_tool_call(self, llm_response, session_id=None):
         # 解析 JSON
         match = re.search(r"```json\n(.*?)\n```", llm_response, re.DOTALL)
         if match:
@@ -67,18 +150,28 @@ class UnrealAgent:
             tool_name = data["tool"]
             args = data["args"]
 
-            # 动态调用
-            if tool_name in self.registry.skills:
-                unreal.log(f"🔨 执行工具: {tool_name}")
-                func = self.registry.skills[tool_name]
-                # 参数校验（基于 tool_def.json -> pydantic 优先）
-                try:
-                    self.registry.validate_tool_call(tool_name, args)
-                except ValueError as ve:
-                    unreal.log_error(f"❌ 参数校验失败: {ve}")
-                    return
-
-                result = func(**args)  # 传入参数
-                unreal.log(result)
-            else:
-                unreal.log_error(f"❌ 未找到工具: {tool_name}")
+            result, duplicate = self._dispatch_tool(tool_name, args, session_id)
+            return tool_name, args, result, duplicate
+        return None
+
+    def _dispatch_tool(self, tool_name, args, session_id=None):
+        # 动态调用，返回 (结果, 是否为被忽略的重复调用)
+        if tool_name in self.registry.skills:
+            log(f"🔨 执行工具: {tool_name}")
+            func = self.registry.skills[tool_name]
+            # 参数校验（基于 tool_def.json -> pydantic 优先）
+            try:
+                self.registry.validate_tool_call(tool_name, args)
+            except ValueError as ve:
+                log_error(f"❌ 参数校验失败: {ve}")
+                return {"status": "error", "msg": f"参数校验失败: {ve}"}, False
+
+            pure = bool(self.registry.tool_defs.get(tool_name, {}).get("pure"))
+            result, duplicate = self.tool_guard.call(tool_name, args, lambda: func(**args), session_id=session_id, pure=pure)
+            if duplicate:
+                log(f"⏭️ 忽略重复调用: {tool_name}")
+            log(result)
+            return result, duplicate
+        else:
+            log_error(f"❌ 未找到工具: {tool_name}")
+            return {"status": "error", "msg": f"未找到工具: {tool_name}"}, False
@@ -0,0 +1,150 @@
+"""Speculative asset prefetch driven by the streaming LLM response.
+
+`AssetPrefetcher.feed` receives text fragments while the model is still answering. As soon
+as a complete `"building_type": "<value>"` pair has streamed in, the value is resolved to an
+asset path and queued; queued assets are loaded right away, between stream chunks, so the
+load overlaps with the model generating the rest of its answer. Loading happens on the
+calling thread because Editor APIs must stay on the game thread.
+
+The spawn path picks up prefetched assets through `take()` (see `ue_bridge.load_asset`).
+Whatever is not used is dropped by `cancel()`. `metrics()` reports how much load time was
+hidden from the spawn.
+
+Prefetching is speculative: resolver and loader errors are counted in `stats["errors"]` and
+never propagate into the stream callback, so they cannot fail the LLM request.
+"""
+
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_active: Optional["AssetPrefetcher"] = None
+
+
+class AssetPrefetcher:
+    def __init__(self, resolver: Callable[[str], Optional[str]], loader: Optional[Callable[[str], Any]] = None,
+                 fields: Iterable[str] = ("building_type",), max_pending: int = 4, max_ready: int = 8):
+        """
+        resolver: maps a streamed value (e.g. "blacksmith") to an asset path, or None if unknown.
+        loader:   loads an asset path and returns the asset (None if missing); defaults to the UE bridge.
+        fields:   argument names whose string values trigger a prefetch.
+        """
+        self.resolver = resolver
+        self.loader = loader
+        self.max_pending = max_pending
+        self.max_ready = max_ready
+        names = "|".join(re.escape(f) for f in fields)
+        self._pattern = re.compile(r'"(?:%s)"\s*:\s*"([^"]+)"' % names)
+
+        self._buffer = ""
+        self._scan_from = 0
+        self._seen = set()
+        self._pending = deque()  # asset paths waiting to be loaded
+        self._ready: "OrderedDict[str, tuple]" = OrderedDict()  # path -> (asset, load_seconds)
+        self.stats = {
+            "scheduled": 0, "loaded": 0, "used": 0, "dropped": 0, "discarded": 0, "errors": 0,
+            "hidden_seconds": 0.0, "wasted_seconds": 0.0,
+        }
+
+    def feed(self, fragment: str):
+        """Scan a new streamed fragment for trigger fields, then load what was queued."""
+        self._buffer += fragment
+        for match in self._pattern.finditer(self._buffer, self._scan_from):
+            self._scan_from = match.end()
+            self.schedule_key(match.group(1))
+        self.pump()
+
+    def schedule_key(self, key: str):
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        try:
+            asset_path = self.resolver(key)
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        if asset_path:
+            self.schedule(asset_path)
+
+    def schedule(self, asset_path: str):
+        if asset_path in self._ready or asset_path in self._pending:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            return
+        self._pending.append(asset_path)
+        self.stats["scheduled"] += 1
+
+    def pump(self):
+        """Load every queued asset (existence check + load)."""
+        loader = self.loader or _default_loader
+        while self._pending:
+            asset_path = self._pending.popleft()
+            start = time.perf_counter()
+            try:
+                asset = loader(asset_path)
+            except Exception:
+                self.stats["errors"] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            if asset is None:
+                continue
+            self._ready[asset_path] = (asset, elapsed)
+            self.stats["loaded"] += 1
+            while len(self._ready) > self.max_ready:
+                _, (_, dropped_seconds) = self._ready.popitem(last=False)
+                self.stats["discarded"] += 1
+                self.stats["wasted_seconds"] += dropped_seconds
+
+    def take(self, asset_path: str):
+        """Prefetched asset for `asset_path`, or None. Queued-but-unloaded entries are cancelled."""
+        entry = self._ready.pop(asset_path, None)
+        if entry is None:
+            try:
+                self._pending.remove(asset_path)
+            except ValueError:
+                pass
+            return None
+        asset, load_seconds = entry
+        self.stats["used"] += 1
+        self.stats["hidden_seconds"] += load_seconds
+        return asset
+
+    def cancel(self):
+        """Drop queued loads and release prefetched assets that were never used."""
+        self._pending.clear()
+        for _, load_seconds in self._ready.values():
+            self.stats["discarded"] += 1
+            self.stats["wasted_seconds"] += load_seconds
+        self._ready.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        out = dict(self.stats)
+        out["hidden_ms"] = round(self.stats["hidden_seconds"] * 1000, 2)
+        out["wasted_ms"] = round(self.stats["wasted_seconds"] * 1000, 2)
+        out["hit_rate"] = self.stats["used"] / self.stats["loaded"] if self.stats["loaded"] else 0.0
+        return out
+
+
+def _default_loader(asset_path: str):
+    from agent_core.ue_bridge import load_asset_now
+    return load_asset_now(asset_path)
+
+
+@contextmanager
+def activate(prefetcher: AssetPrefetcher):
+    """Make `prefetcher` visible to `take()` for the duration of the block; unused entries are cancelled on exit."""
+    global _active
+    previous, _active = _active, prefetcher
+    try:
+        yield prefetcher
+    finally:
+        _active = previous
+        prefetcher.cancel()
+
+
+def take(asset_path: str):
+    """Prefetched asset from the active prefetcher, or None."""
+    return _active.take(asset_path) if _active is not None else None
@@ -0,0 +1,147 @@
+"""Tail-latency helpers for LLM calls: latency tracking, backoff, circuit breaker, endpoints.
+
+These are deliberately dependency-free so they can be unit-tested without any network.
+`DeepseekClient` combines them into retries with jittered backoff, hedged requests and
+latency-aware endpoint selection.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every endpoint's circuit breaker is open (fail fast)."""
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (seconds) with percentile and EWMA."""
+
+    def __init__(self, window: int = 50, alpha: float = 0.3):
+        self.samples = deque(maxlen=window)
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+            self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when empty."""
+        with self._lock:
+            data = sorted(self.samples)
+        if not data:
+            return None
+        rank = max(0, min(len(data) - 1, math.ceil(p / 100.0 * len(data)) - 1))
+        return data[rank]
+
+    def __len__(self):
+        return len(self.samples)
+
+
+class CircuitBreaker:
+    """Classic closed -> open -> half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests are
+    rejected until `reset_timeout` seconds pass; then it is half-open and the next
+    result decides whether it closes again or re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                # Trip, or re-open after a failed half-open probe
+                self.opened_at = self.clock()
+
+
+class Endpoint:
+    """One (base_url, model) upstream with its own latency stats and breaker."""
+
+    def __init__(self, base_url: str, model: str, breaker: Optional[CircuitBreaker] = None, tracker: Optional[LatencyTracker] = None):
+        self.base_url = base_url
+        self.model = model
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = tracker or LatencyTracker()
+        self.first_fragment = LatencyTracker()  # streamed attempts: time to the first fragment
+        self._inflight: Dict[object, float] = {}  # attempt token -> start time
+        self._lock = threading.Lock()
+
+    def begin_attempt(self) -> object:
+        token = object()
+        with self._lock:
+            self._inflight[token] = time.perf_counter()
+        return token
+
+    def end_attempt(self, token: object):
+        with self._lock:
+            self._inflight.pop(token, None)
+
+    def score(self) -> tuple:
+        """Sort key, lower is better: consecutive failures first, then latency.
+
+        Latency is the EWMA of successful attempts, raised to the age of the oldest attempt
+        still running: a hung request makes the endpoint look as slow as it really is before
+        it times out. An endpoint that fails fast is never mistaken for a fast one, and
+        endpoints without samples score 0 so they get tried.
+        """
+        latency = self.latency.ewma or 0.0
+        with self._lock:
+            oldest = min(self._inflight.values(), default=None)
+        if oldest is not None:
+            latency = max(latency, time.perf_counter() - oldest)
+        return self.breaker.failures, latency
+
+    def __repr__(self):
+        return f"Endpoint({self.base_url!r}, {self.model!r}, {self.breaker.state})"
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 4.0, rng: Optional[random.Random] = None) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2**attempt))."""
+    rng = rng or random
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def is_retryable(error: Exception) -> bool:
+    """Client errors (4xx except 408/429) are not worth retrying; everything else is."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+        return False
+    return True
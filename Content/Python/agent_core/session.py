@@ -0,0 +1,191 @@
+"""Per-session conversation memory with a bounded token window.
+
+A `ConversationSession` keeps recent turns verbatim and folds older ones into one-line
+summaries plus a small structured state (recent tool calls), so follow-ups such as
+"move it 10m north" still have context. Token counts are computed once per message
+when it is added and kept as running totals; nothing is re-tokenized per turn.
+"""
+
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: one token per CJK/non-ASCII char, ~4 ASCII chars per token."""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` (keeping its start) so that it estimates to at most `max_tokens`."""
+    if max_tokens <= 0:
+        return ""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = len(text) * max_tokens // tokens
+    while cut > 0 and estimate_tokens(text[:cut] + "…") > max_tokens:
+        cut -= max(1, cut // 10)
+    return text[:cut] + "…" if cut > 0 else ""
+
+
+class ConversationSession:
+    """Recent turns + compacted summary + structured state, kept under `token_budget`."""
+
+    MESSAGE_OVERHEAD = 4  # role/formatting tokens per chat message
+
+    def __init__(self, session_id: str, token_budget: int = 2000, min_recent: int = 4,
+                 summary_line_chars: int = 80, max_summary_lines: int = 20, max_recent_actions: int = 10):
+        self.session_id = session_id
+        self.token_budget = token_budget
+        self.min_recent = min_recent
+        self.summary_line_chars = summary_line_chars
+
+        self.turns = deque()  # (message, tokens)
+        self.turn_tokens = 0
+        self.summary = deque()  # (line, tokens)
+        self.summary_tokens = 0
+        self.max_summary_lines = max_summary_lines
+        # Structured state that survives compaction
+        self.recent_actions = deque(maxlen=max_recent_actions)
+        self._state_text = ""
+        self.state_tokens = 0
+        self.turn_count = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.turn_tokens + self.summary_tokens + self.state_tokens
+
+    def add_user(self, text: str):
+        self.turn_count += 1
+        self._append({"role": "user", "content": text})
+
+    def add_assistant(self, text: str):
+        self._append({"role": "assistant", "content": text})
+
+    def add_tool_result(self, tool_name: str, args: Dict[str, Any], result: Any):
+        """Record an executed tool call as an assistant turn and in the structured state."""
+        args_text = json.dumps(args, ensure_ascii=False, sort_keys=True)
+        self._append({"role": "assistant", "content": f"已执行 {tool_name}({args_text}) -> {_shorten(result, 200)}"})
+        self.recent_actions.append({"tool": tool_name, "args": args})
+        self._update_state()
+        self._compact()
+
+    def add_tool_error(self, tool_name: str, args: Dict[str, Any], error: Any):
+        """Record a rejected or failed tool call as a note only; it stays out of the structured state."""
+        args_text = json.dumps(args, ensure_ascii=False, sort_keys=True)
+        self._append({"role": "assistant", "content": f"未执行 {tool_name}({args_text}): {_shorten(error, 200)}"})
+
+    def messages(self) -> List[Dict[str, str]]:
+        """History to place between the system prompt and the new user message."""
+        out = []
+        memory = self._memory_text()
+        if memory:
+            out.append({"role": "system", "content": memory})
+        out.extend(m for m, _ in self.turns)
+        return out
+
+    def _memory_text(self) -> str:
+        parts = []
+        if self.summary:
+            parts.append("较早的对话摘要:\n" + "\n".join(line for line, _ in self.summary))
+        if self._state_text:
+            parts.append(self._state_text)
+        return "\n\n".join(parts)
+
+    def _update_state(self):
+        if not self.recent_actions:
+            self._state_text = ""
+        else:
+            self._state_text = "最近的工具调用:\n" + "\n".join(
+                f"- {a['tool']} {json.dumps(a['args'], ensure_ascii=False, sort_keys=True)}" for a in self.recent_actions
+            )
+        self.state_tokens = estimate_tokens(self._state_text)
+
+    def _append(self, message: Dict[str, str]):
+        tokens = estimate_tokens(message["content"]) + self.MESSAGE_OVERHEAD
+        self.turns.append((message, tokens))
+        self.turn_tokens += tokens
+        self._compact()
+
+    def _compact(self):
+        """Fold the oldest turns into summary lines until the session fits the budget."""
+        while self.total_tokens > self.token_budget and len(self.turns) > self.min_recent:
+            message, tokens = self.turns.popleft()
+            self.turn_tokens -= tokens
+            line = f"{message['role']}: {_shorten(message['content'], self.summary_line_chars)}"
+            line_tokens = estimate_tokens(line)
+            self.summary.append((line, line_tokens))
+            self.summary_tokens += line_tokens
+            if len(self.summary) > self.max_summary_lines:
+                _, dropped = self.summary.popleft()
+                self.summary_tokens -= dropped
+
+        # Still over budget with only recent turns left: drop summary lines, oldest first
+        while self.total_tokens > self.token_budget and self.summary:
+            _, dropped = self.summary.popleft()
+            self.summary_tokens -= dropped
+
+        # The recent turns alone exceed the budget (long messages): truncate them, oldest
+        # first; turns with nothing left are dropped
+        if self.total_tokens > self.token_budget:
+            kept = deque()
+            for message, tokens in self.turns:
+                excess = self.total_tokens - self.token_budget
+                if excess > 0:
+                    content = _truncate_to_tokens(message["content"], tokens - self.MESSAGE_OVERHEAD - excess)
+                    self.turn_tokens -= tokens
+                    if not content:
+                        continue
+                    message = dict(message, content=content)
+                    tokens = estimate_tokens(content) + self.MESSAGE_OVERHEAD
+                    self.turn_tokens += tokens
+                kept.append((message, tokens))
+            self.turns = kept
+
+        # Last resort: the structured state itself is too large
+        while self.total_tokens > self.token_budget and self.recent_actions:
+            self.recent_actions.popleft()
+            self._update_state()
+
+
+class SessionStore:
+    """LRU map of session id -> ConversationSession, bounded by `max_sessions`."""
+
+    def __init__(self, max_sessions: int = 64, **session_kwargs):
+        self.max_sessions = max_sessions
+        self.session_kwargs = session_kwargs
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> ConversationSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = ConversationSession(session_id, **self.session_kwargs)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def reset(self, session_id: Optional[str] = None):
+        """Forget one session, or all of them."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
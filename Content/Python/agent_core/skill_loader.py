@@ -8,10 +8,15 @@ class SkillRegistry:
         self.skills = {}  # 存储 { "spawn_medieval_building": skill_instance.method }
         self.prompts = []  # 存储所有的 README 内容
         self.tool_defs = {}  # 存储工具的结构化定义 (来自 tool_def.json)
+        self._models = {}  # 缓存每个工具的 pydantic 校验模型（首次校验时构建）
         self._load_skills(skills_root_path)
 
     def validate_tool_call(self, tool_name: str, args: dict):
-        """Validate args for a given tool using tool_defs. Raises ValueError on invalid."""
+        """Validate args for a given tool using tool_defs. Raises ValueError on invalid.
+
+        The pydantic model of each tool is built on first use and cached, so pydantic is
+        only imported when the first tool call is validated.
+        """
         if tool_name not in self.tool_defs:
             return True
 
@@ -20,68 +25,85 @@ class SkillRegistry:
             return True
 
         # Prefer pydantic for validation
+        model = self._get_model(tool_name, schema)
+        if model is None:
+            return self._fallback_validate(schema, args)
         try:
-            from pydantic import BaseModel, ValidationError, create_model
-            from typing import List, Optional
-
-            props = schema.get("properties", {})
-            required = set(schema.get("required", []))
-            fields = {}
-            for name, ps in props.items():
-                ptype = ps.get("type")
-                if ptype == "string":
-                    python_type = (str, ... if name in required else None)
-                elif ptype == "number":
-                    python_type = (float, ... if name in required else None)
-                elif ptype == "integer":
-                    python_type = (int, ... if name in required else None)
-                elif ptype == "array":
-                    python_type = (list, ... if name in required else None)
-                elif ptype == "boolean":
-                    python_type = (bool, ... if name in required else None)
-                else:
-                    python_type = (object, ... if name in required else None)
-
-                # create_model expects keyword as name=(type, default)
-                default = ... if name in required else None
-                fields[name] = (python_type[0], default)
-
-            Model = create_model(f"Tool_{tool_name}_Model", **fields)
-            Model(**args)
-            return True
-        except ImportError:
-            # Fallback lightweight validation
-            props = schema.get("properties", {})
-            required = schema.get("required", [])
-            missing = [r for r in required if r not in args]
-            if missing:
-                raise ValueError(f"Missing required params: {missing}")
-
-            # Basic type checks
-            for name, ps in props.items():
-                if name in args and args[name] is not None:
-                    ptype = ps.get("type")
-                    val = args[name]
-                    if ptype == "array":
-                        if not isinstance(val, list):
-                            raise ValueError(f"Param {name} must be a list")
-                        min_items = ps.get("minItems")
-                        max_items = ps.get("maxItems")
-                        if min_items is not None and len(val) < min_items:
-                            raise ValueError(f"Param {name} must have at least {min_items} items")
-                        if max_items is not None and len(val) > max_items:
-                            raise ValueError(f"Param {name} must have at most {max_items} items")
-                    if ptype == "number":
-                        if not isinstance(val, (int, float)):
-                            raise ValueError(f"Param {name} must be a number")
-                    if ptype == "string":
-                        if not isinstance(val, str):
-                            raise ValueError(f"Param {name} must be a string")
+            model(**args)
             return True
         except Exception as e:
             # Re-raise as ValueError for consistent handling
             raise ValueError(str(e))
 
+    def _get_model(self, tool_name: str, schema: dict):
+        """Cached pydantic model for a tool, or None when pydantic is not installed."""
+        if tool_name in self._models:
+            return self._models[tool_name]
+
+        try:
+            from pydantic import Field, create_model
+        except ImportError:
+            self._models[tool_name] = None
+            return None
+
+        from typing import Any, List, Optional
+
+        scalar_types = {"string": str, "number": float, "integer": int, "boolean": bool}
+        required = set(schema.get("required", []))
+        fields = {}
+        for name, ps in schema.get("properties", {}).items():
+            ptype = ps.get("type")
+            constraints = {}
+            if ptype == "array":
+                item_type = scalar_types.get((ps.get("items") or {}).get("type"), Any)
+                python_type = List[item_type]
+                if ps.get("minItems") is not None:
+                    constraints["min_length"] = ps["minItems"]
+                if ps.get("maxItems") is not None:
+                    constraints["max_length"] = ps["maxItems"]
+            else:
+                python_type = scalar_types.get(ptype, Any)
+
+            # create_model expects keyword as name=(type, default)
+            if name in required:
+                fields[name] = (python_type, Field(..., **constraints))
+            else:
+                fields[name] = (Optional[python_type], Field(None, **constraints))
+
+        model = create_model(f"Tool_{tool_name}_Model", **fields)
+        self._models[tool_name] = model
+        return model
+
+    def _fallback_validate(self, schema: dict, args: dict):
+        """Lightweight validation used when pydantic is not installed."""
+        props = schema.get("properties", {})
+        required = schema.get("required", [])
+        missing = [r for r in required if r not in args]
+        if missing:
+            raise ValueError(f"Missing required params: {missing}")
+
+        # Basic type checks
+        for name, ps in props.items():
+            if name in args and args[name] is not None:
+                ptype = ps.get("type")
+                val = args[name]
+                if ptype == "array":
+                    if not isinstance(val, list):
+                        raise ValueError(f"Param {name} must be a list")
+                    min_items = ps.get("minItems")
+                    max_items = ps.get("maxItems")
+                    if min_items is not None and len(val) < min_items:
+                        raise ValueError(f"Param {name} must have at least {min_items} items")
+                    if max_items is not None and len(val) > max_items:
+                        raise ValueError(f"Param {name} must have at most {max_items} items")
+                if ptype == "number":
+                    if not isinstance(val, (int, float)):
+                        raise ValueError(f"Param {name} must be a number")
+                if ptype == "string":
+                    if not isinstance(val, str):
+                        raise ValueError(f"Param {name} must be a string")
+        return True
+
     def _load_skills(self, root_path):
         if not os.path.exists(root_path):
             print(f"⚠️ Skills 目录不存在: {root_path}")
@@ -1,18 +1,21 @@
 import os
 import json
 import importlib.util
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from agent_core.base_tool import BaseTool
+from agent_core.idempotency import ToolCallGuard
 
 class SkillManager:
     """Loads skills (BaseTool subclasses), exposes RAG-like retrieval and execution."""
 
-    def __init__(self, skills_root: str):
+    def __init__(self, skills_root: str, dedupe_window: float = 5.0, memo_size: int = 128):
         self.skills_root = skills_root
         self.registry: Dict[str, BaseTool] = {}
         self.definitions: List[Dict[str, Any]] = []
         self.index: List[Dict[str, Any]] = []  # simple keyword index
+        self.pure_tools = set()  # tools declared "pure": true in tool_def.json
+        self.guard = ToolCallGuard(dedupe_window=dedupe_window, memo_size=memo_size)
 
         self._load_all_skills()
 
@@ -78,6 +81,8 @@ class SkillManager:
                 # register
                 self.registry[tname] = cls
                 self.definitions.append(t)
+                if t.get('pure'):
+                    self.pure_tools.add(tname)
                 self.index.append({
                     'name': tname,
                     'desc': t.get('description', ''),
@@ -99,10 +104,15 @@ class SkillManager:
         top_names = [t[1] for t in scored[:top_k]]
         return [d for d in self.definitions if d.get('name') in top_names]
 
-    def execute_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
-        if tool_name in self.registry:
+    def execute_tool(self, tool_name: str, session_id: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Run a tool. Identical calls within the dedupe window return the earlier result."""
+        if tool_name not in self.registry:
+            return {"status": "error", "msg": f"Tool {tool_name} not found"}
+
+        def call():
             try:
                 return self.registry[tool_name].run(**kwargs)
             except Exception as e:
                 return {"status": "error", "msg": str(e)}
-        return {"status": "error", "msg": f"Tool {tool_name} not found"}
+
+        return self.guard.execute(tool_name, kwargs, call, session_id=session_id, pure=tool_name in self.pure_tools)
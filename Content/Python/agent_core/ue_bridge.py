@@ -2,15 +2,65 @@
 
 All code that interacts with `unreal` should go through this module so the rest
 of the system can run safely in a non-UE environment (mock mode).
+
+`unreal` is resolved lazily by `get_unreal()`: inside the Editor it is already in
+`sys.modules`, outside it the failed import is attempted only once.
 """
 
-try:
-    import unreal  # type: ignore
-    _HAS_UNREAL = True
-except Exception:
-    _HAS_UNREAL = False
-    unreal = None
-    print("⚠️ 运行在模拟模式 (无 UE5 环境)")
+import sys
+
+_UNREAL_MISSING = False
+
+
+def get_unreal():
+    """Return the `unreal` module, or None when running outside the Editor (mock mode)."""
+    global _UNREAL_MISSING
+    module = sys.modules.get("unreal")
+    if module is not None or _UNREAL_MISSING:
+        return module
+    try:
+        import unreal  # type: ignore
+        return unreal
+    except Exception:
+        _UNREAL_MISSING = True
+        print("⚠️ 运行在模拟模式 (无 UE5 环境)")
+        return None
+
+
+def log(msg):
+    """unreal.log in the Editor, print otherwise."""
+    unreal = get_unreal()
+    if unreal is not None:
+        unreal.log(msg)
+    else:
+        print(msg)
+
+
+def log_error(msg):
+    """unreal.log_error in the Editor, print otherwise."""
+    unreal = get_unreal()
+    if unreal is not None:
+        unreal.log_error(msg)
+    else:
+        print(msg)
+
+
+def load_asset_now(asset_path: str):
+    """Existence check + load. Returns None when the asset is missing or not in the Editor."""
+    unreal = get_unreal()
+    if unreal is None or not unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+        return None
+    return unreal.EditorAssetLibrary.load_asset(asset_path)
+
+
+def load_asset(asset_path: str):
+    """Load an asset, reusing a speculative prefetch (agent_core.prefetch) when one is ready."""
+    from agent_core import prefetch
+
+    asset = prefetch.take(asset_path)
+    if asset is not None:
+        return asset
+    return load_asset_now(asset_path)
 
 
 class UEBridge:
@@ -23,11 +73,13 @@ class UEBridge:
         """
         rotation = rotation or [0, 0, 0]
 
-        if not _HAS_UNREAL:
+        unreal = get_unreal()
+        if unreal is None:
             return {"status": "mock_success", "msg": f"Mock Spawn {asset_path} at {location}"}
 
-        # 1. Asset existence check
-        if not unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+        # 1. Asset existence check + load (prefetched while the LLM was still streaming, if possible)
+        mesh = load_asset(asset_path)
+        if mesh is None:
             return {
                 "status": "error",
                 "code": "ASSET_MISSING",
@@ -42,9 +94,7 @@ class UEBridge:
             actor_class = unreal.StaticMeshActor
             actor = unreal.EditorLevelLibrary.spawn_actor_from_class(actor_class, vec_loc, rot_rot)
 
-            # Load mesh and set it
-            mesh = unreal.EditorAssetLibrary.load_asset(asset_path)
-            # try common component access patterns
+            # Set the mesh; try common component access patterns
             if hasattr(actor, 'static_mesh_component') and actor.static_mesh_component:
                 actor.static_mesh_component.set_static_mesh(mesh)
             else:
@@ -0,0 +1,68 @@
+"""Compare the prompt + regex path with native function calling against a local stub server.
+
+Usage (from Content/Python):
+    python -m benchmarks.bench_llm_modes --runs 50 --prefill-ms-per-1k 40
+
+The stub estimates prompt tokens from the request body and can sleep proportionally to
+simulate upstream prefill cost, so the latency column reflects prompt size.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.llm import DeepseekClient
+from agent_core.main_agent import TOOL_SYSTEM_PROMPT, UnrealAgent
+from tests.stub_llm_server import StubLLMServer, default_responder, estimate_tokens
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    def responder(payload):
+        prompt = json.dumps(payload.get("messages", []), ensure_ascii=False)
+        prompt += json.dumps(payload.get("tools", []), ensure_ascii=False)
+        time.sleep(estimate_tokens(prompt) / 1000.0 * args.prefill_ms_per_1k / 1000.0)
+        return default_responder(payload)
+
+    # Use the agent's own prompts so the numbers track what it actually sends
+    agent = UnrealAgent()
+    legacy_prompt = agent._build_system_prompt()
+
+    with StubLLMServer(responder) as server:
+        client = DeepseekClient(api_key="bench", base_url=server.url, model="stub")
+        client.register_tools(agent.registry.tool_defs)
+
+        results = {}
+        for mode in ("prompt+regex", "native tools"):
+            tokens, latencies, parsed = [], [], 0
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                if mode == "prompt+regex":
+                    text = client.generate(legacy_prompt, "在原点放一个铁匠铺")
+                    match = re.search(r"```json\n(.*?)\n```", text, re.DOTALL)
+                    parsed += bool(match and json.loads(match.group(1)).get("tool"))
+                else:
+                    result = client.generate_tool_calls(TOOL_SYSTEM_PROMPT, "在原点放一个铁匠铺")
+                    parsed += bool(result["tool_calls"])
+                latencies.append((time.perf_counter() - start) * 1000)
+                tokens.append(client.last_usage["prompt_tokens"])
+            results[mode] = (statistics.mean(tokens), statistics.median(latencies), parsed)
+
+    print(f"{'mode':<14} {'prompt_tokens':>14} {'p50_ms':>10} {'parsed':>8}")
+    for mode, (tokens, p50, parsed) in results.items():
+        print(f"{mode:<14} {tokens:>14.0f} {p50:>10.2f} {parsed:>5}/{args.runs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from typing import Any
+from agent_core.asset_catalog import SPAWNABLE_CLASSES, get_project_catalog, register_seed
 from agent_core.base_tool import BaseTool
 from agent_core.ue_bridge import UEBridge
 
@@ -6,16 +7,23 @@ class MedievalBuilderSkill(BaseTool):
     name = "spawn_medieval_building"
     description = "Spawn a medieval building at a location"
 
-    def run(self, building_type: str, location: list, rotation_yaw: float = 0) -> Any:
-        # 1. Lookup
-        if building_type not in self.config:
-            return {
-                "status": "error",
-                "msg": f"未知建筑类型 '{building_type}'. 可用类型: {list(self.config.keys())}"
-            }
+    def __init__(self, config_path=None):
+        super().__init__(config_path)
+        # config keys become aliases in the project asset catalog (built lazily on first lookup)
+        register_seed(self.config)
 
-        asset_info = self.config[building_type]
-        asset_path = asset_info.get("asset_path", "")
+    def run(self, building_type: str, location: list, rotation_yaw: float = 0) -> Any:
+        # 1. Lookup: config.json first, then the project asset catalog (fuzzy)
+        if building_type in self.config:
+            asset_path = self.config[building_type].get("asset_path", "")
+        else:
+            record = get_project_catalog().resolve(building_type, classes=SPAWNABLE_CLASSES)
+            if record is None:
+                return {
+                    "status": "error",
+                    "msg": f"未知建筑类型 '{building_type}'. 可用类型: {list(self.config.keys())}"
+                }
+            asset_path = record["path"]
 
         # 2. Use the UE bridge
         result = UEBridge.safe_spawn_actor(
@@ -1,7 +1,9 @@
-import unreal
 import json
 import os
 
+from agent_core.asset_catalog import SPAWNABLE_CLASSES, get_project_catalog, register_seed
+from agent_core.ue_bridge import get_unreal, load_asset
+
 class Skill:
     """
     每个 Skill 文件夹下必须包含这个类，作为入口。
@@ -12,23 +14,35 @@ class Skill:
         with open(os.path.join(current_dir, "assets_config.json"), 'r', encoding='utf-8') as f:
             self.config = json.load(f)
 
-        # 使用模块方式访问 Editor API（更可靠）
-        self.editor_level_lib = unreal.EditorLevelLibrary
-        self.editor_asset_lib = unreal.EditorAssetLibrary
+        # catalog 中的 key 作为项目资产索引的别名（索引本身在首次查找时才构建）
+        register_seed(self.config["catalog"])
+
+    # 使用模块方式访问 Editor API（更可靠）；首次使用时才解析 unreal
+    @property
+    def _editor_level_lib(self):
+        return get_unreal().EditorLevelLibrary
 
     def spawn_medieval_building(self, building_type, location, rotation_yaw=0):
         """
         对应 README.md 中的工具名称
         """
-        # 1. 查表获取路径
-        if building_type not in self.config["catalog"]:
-            return f"Error: Unknown type '{building_type}'"
-
-        asset_info = self.config["catalog"][building_type]
+        # 1. 查表获取路径（先查 catalog，未命中则在项目资产索引中模糊查找）
+        if building_type in self.config["catalog"]:
+            asset_info = self.config["catalog"][building_type]
+        else:
+            record = get_project_catalog().resolve(building_type, classes=SPAWNABLE_CLASSES)
+            if record is None:
+                return f"Error: Unknown type '{building_type}'"
+            asset_info = {"asset_path": record["path"], "offset_z": 0}
         path = asset_info["asset_path"]
 
-        # 2. 检查资产
-        if not self.editor_asset_lib.does_asset_exist(path):
+        unreal = get_unreal()
+        if unreal is None:
+            return f"Mock: Spawned {building_type} ({path}) at {location}"
+
+        # 2. 检查并加载资产（若 LLM 流式输出期间已预取则直接复用）
+        mesh = load_asset(path)
+        if not mesh:
             return f"Error: Asset not found at {path}"
 
         # 3. 准备数据 (利用 unreal API)
@@ -36,15 +50,11 @@ class Skill:
         u_rot = unreal.Rotator(0, rotation_yaw, 0)
 
         # 4. 生成 Actor
-        actor = self.editor_level_lib.spawn_actor_from_class(unreal.StaticMeshActor, u_loc, u_rot)
+        actor = self._editor_level_lib.spawn_actor_from_class(unreal.StaticMeshActor, u_loc, u_rot)
         if not actor:
             return "Error: Failed to spawn actor"
 
-        # 5. 加载并设置模型
-        mesh = self.editor_asset_lib.load_asset(path)
-        if not mesh:
-            return f"Error: Failed to load mesh at {path}"
-
+        # 5. 设置模型
         # 尝试设置静态网格组件
         try:
             # 有时属性名为 static_mesh_component 或 StaticMeshComponent
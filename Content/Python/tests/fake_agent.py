@@ -0,0 +1,38 @@
+"""Shared agent fixtures for tests: a real `UnrealAgent` with a recording spawn tool and a fake LLM.
+
+Outside the Editor `agent_core` needs no `unreal` stub (it is imported lazily), so the agent is
+built as-is: no API key (the LLM is replaced by the test) and the project catalog built from
+the skill seeds.
+"""
+from agent_core.llm import build_tool_schemas
+
+
+def make_agent(monkeypatch, result="ok"):
+    """`(agent, spawned)`: spawn_medieval_building records its kwargs in `spawned` and returns `result`."""
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    from agent_core.main_agent import UnrealAgent
+
+    agent = UnrealAgent()
+    spawned = []
+    agent.registry.skills["spawn_medieval_building"] = lambda **kw: spawned.append(kw) or result
+    return agent, spawned
+
+
+class FakeLLM:
+    """Native function-calling stand-in that answers every request with the same tool calls.
+
+    `calls` is a list of `(tool, args)`; each request's system prompt, input and history are
+    recorded in `requests`.
+    """
+
+    def __init__(self, agent, calls, content=None):
+        self.tools = build_tool_schemas(agent.registry.tool_defs)
+        self.calls = calls
+        self.content = content
+        self.requests = []
+
+    def generate_tool_calls(self, system_prompt, user_input, history=None, on_delta=None):
+        self.requests.append({"system_prompt": system_prompt, "user_input": user_input, "history": history})
+        return {"content": self.content, "tool_calls": [
+            {"id": f"c{i}", "tool": tool, "args": dict(args)} for i, (tool, args) in enumerate(self.calls)
+        ]}
@@ -0,0 +1,176 @@
+"""Local OpenAI-compatible stub server for LLM client tests and benchmarks.
+
+Serves `POST /v1/chat/completions` on 127.0.0.1 with a random port. The reply is built by a
+`responder(payload) -> dict` callable; `usage` is filled in with a rough token estimate of the
+request (messages + tools) so prompt sizes can be compared between modes.
+
+Responders inject latency by sleeping and inject errors by raising `StubHTTPError(status)`.
+Requests with `"stream": true` get the reply as server-sent events, split into
+`stream_chunk_chars`-sized fragments sent `stream_delay` seconds apart.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHTTPError(Exception):
+    def __init__(self, status: int = 500, message: str = "injected error"):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough tokenizer: one token per CJK char, ~4 ASCII chars per token."""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def tool_call_reply(calls, content=None):
+    """Build a chat completion body with `tool_calls` from [(name, args), ...]."""
+    return {
+        "choices": [{
+            "index": 0,
+            "finish_reason": "tool_calls",
+            "message": {
+                "role": "assistant",
+                "content": content,
+                "tool_calls": [
+                    {
+                        "id": f"call_{i}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": json.dumps(args)},
+                    }
+                    for i, (name, args) in enumerate(calls)
+                ],
+            },
+        }],
+    }
+
+
+def text_reply(content):
+    return {
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+    }
+
+
+def default_responder(payload):
+    """Spawn a blacksmith: via tool_calls when tools are offered, else as a fenced JSON block."""
+    args = {"building_type": "blacksmith", "location": [0, 0, 0], "rotation_yaw": 90}
+    if payload.get("tools"):
+        return tool_call_reply([("spawn_medieval_building", args)])
+    block = json.dumps({"tool": "spawn_medieval_building", "args": args}, indent=2)
+    return text_reply(f"好的，我来生成铁匠铺。\n```json\n{block}\n```")
+
+
+def stream_chunks(body, chunk_chars=8):
+    """Split a chat completion body into streaming chunks (content and tool-call argument deltas)."""
+    message = body["choices"][0]["message"]
+    content = message.get("content") or ""
+    for i in range(0, len(content), chunk_chars):
+        yield {"choices": [{"index": 0, "delta": {"content": content[i:i + chunk_chars]}}]}
+    for index, tc in enumerate(message.get("tool_calls") or []):
+        yield {"choices": [{"index": 0, "delta": {"tool_calls": [{
+            "index": index, "id": tc["id"], "type": "function",
+            "function": {"name": tc["function"]["name"], "arguments": ""},
+        }]}}]}
+        args = tc["function"]["arguments"]
+        for i in range(0, len(args), chunk_chars):
+            yield {"choices": [{"index": 0, "delta": {"tool_calls": [{
+                "index": index, "function": {"arguments": args[i:i + chunk_chars]},
+            }]}}]}
+    yield {"choices": [{"index": 0, "delta": {}, "finish_reason": body["choices"][0].get("finish_reason", "stop")}]}
+    yield {"choices": [], "usage": body["usage"]}
+
+
+class StubLLMServer:
+    def __init__(self, responder=None, stream_chunk_chars=8, stream_delay=0.0):
+        self.responder = responder or default_responder
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_delay = stream_delay
+        self.requests = []  # decoded request payloads, in arrival order
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                server.requests.append(payload)
+
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+
+                try:
+                    body = dict(server.responder(payload))
+                except StubHTTPError as e:
+                    data = json.dumps({"error": {"message": e.message, "type": "stub_error"}}).encode("utf-8")
+                    self.send_response(e.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                body.setdefault("id", f"chatcmpl-{len(server.requests)}")
+                body.setdefault("object", "chat.completion")
+                body.setdefault("created", 0)
+                body.setdefault("model", payload.get("model", "stub"))
+                if "usage" not in body:
+                    prompt = json.dumps(payload.get("messages", []), ensure_ascii=False)
+                    prompt += json.dumps(payload.get("tools", []), ensure_ascii=False)
+                    completion = json.dumps(body["choices"][0]["message"], ensure_ascii=False)
+                    p, c = estimate_tokens(prompt), estimate_tokens(completion)
+                    body["usage"] = {"prompt_tokens": p, "completion_tokens": c, "total_tokens": p + c}
+
+                if payload.get("stream"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    for chunk in stream_chunks(body, server.stream_chunk_chars):
+                        chunk.update(id=body["id"], object="chat.completion.chunk", created=0, model=body["model"])
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        if server.stream_delay:
+                            time.sleep(server.stream_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                    return
+
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,193 @@
+import os
+import sys
+import time
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core import asset_catalog
+from agent_core.asset_catalog import AssetCatalog, MockAssetRegistry, make_record, name_tokens
+
+
+def _registry():
+    return MockAssetRegistry([
+        make_record("/Game/Medieval/Meshes/SM_House_Small", tags=["medieval"], bounds=[400, 300, 350]),
+        make_record("/Game/Medieval/Meshes/SM_House_Large", tags=["medieval"]),
+        make_record("/Game/Medieval/Meshes/SM_Blacksmith", tags=["medieval", "铁匠铺"]),
+        make_record("/Game/Medieval/Meshes/SM_Watchtower", tags=["medieval", "tower"]),
+        make_record("/Game/Props/SM_HouseSmall_Ruined"),
+    ])
+
+
+def test_name_tokens_strip_type_prefix_and_split_camel_case():
+    assert name_tokens("SM_House_Small") == ["house", "small"]
+    assert name_tokens("BP_WatchTower") == ["watch", "tower"]
+
+
+def test_lookup_by_token_set_prefix_fuzzy_and_tag():
+    catalog = AssetCatalog()
+    catalog.scan(_registry())
+
+    assert catalog.resolve("small house")["name"] == "SM_House_Small"
+    assert catalog.resolve("SM_House_Small")["bounds"] == [400, 300, 350]
+    assert catalog.resolve("hou lar")["name"] == "SM_House_Large"
+    assert catalog.resolve("blaksmith")["name"] == "SM_Blacksmith"
+    assert catalog.resolve("铁匠铺")["name"] == "SM_Blacksmith"
+    assert catalog.resolve("spaceship") is None
+
+
+def test_fuzzy_match_requires_every_query_word():
+    catalog = AssetCatalog()
+    catalog.scan(MockAssetRegistry([
+        make_record("/Game/Medieval/Meshes/SM_House_Small"),
+        make_record("/Game/Medieval/Meshes/SM_Watchtower"),
+        make_record("/Game/Medieval/Meshes/SM_Blacksmith"),
+    ]))
+
+    # Sharing one word with an asset is not a match: a different building must not be spawned
+    assert catalog.resolve("large house") is None
+    assert catalog.resolve("big house") is None
+    assert catalog.resolve("castle tower") is None
+    # Typos in every word still resolve
+    assert catalog.resolve("smal hous")["name"] == "SM_House_Small"
+    assert catalog.resolve("watchtowr")["name"] == "SM_Watchtower"
+
+
+def test_spawn_lookup_skips_non_static_mesh_assets():
+    catalog = AssetCatalog()
+    catalog.scan(MockAssetRegistry([
+        make_record("/Game/Blueprints/BP_Tavern", asset_class="Blueprint"),
+        make_record("/Game/Meshes/SM_Tavern_Ruined", asset_class="StaticMesh"),
+    ]))
+    assert catalog.resolve("tavern")["class"] == "Blueprint"
+    assert catalog.resolve("tavern", classes=asset_catalog.SPAWNABLE_CLASSES)["name"] == "SM_Tavern_Ruined"
+    assert asset_catalog.UnrealAssetRegistry().class_names == {"StaticMesh"}
+
+
+def test_lookup_miss_refreshes_attached_registry(monkeypatch):
+    class PollOnlyRegistry(MockAssetRegistry):
+        def subscribe(self, callback):
+            raise NotImplementedError
+
+    registry = PollOnlyRegistry([make_record("/Game/Medieval/Meshes/SM_Blacksmith")])
+    catalog = AssetCatalog()
+    catalog.scan(registry)
+    catalog.attach(registry, refresh_interval=0)
+
+    # Imported during the session: visible on the first lookup that names it
+    registry.add(make_record("/Game/Medieval/Meshes/SM_Tavern"))
+    assert catalog.resolve("tavern")["path"] == "/Game/Medieval/Meshes/SM_Tavern"
+
+    # Misses are rate limited
+    catalog.refresh_interval = 60
+    registry.add(make_record("/Game/Medieval/Meshes/SM_Well"))
+    assert catalog.resolve("well") is None
+
+    # Speculative lookups never scan the registry
+    catalog.refresh_interval = 0
+    registry.add(make_record("/Game/Medieval/Meshes/SM_Stable"))
+    assert catalog.resolve("stable", refresh=False) is None
+    assert catalog.resolve("stable")["path"] == "/Game/Medieval/Meshes/SM_Stable"
+
+
+def test_incremental_updates_from_registry_events_and_refresh():
+    registry = _registry()
+    catalog = AssetCatalog()
+    catalog.scan(registry)
+    catalog.add_alias("house_small", "/Game/Medieval/Meshes/SM_House_Small")
+    catalog.watch(registry)
+
+    registry.add(make_record("/Game/Medieval/Meshes/SM_Tavern"))
+    assert catalog.resolve("tavern")["path"] == "/Game/Medieval/Meshes/SM_Tavern"
+
+    registry.rename("/Game/Medieval/Meshes/SM_Watchtower", "/Game/Medieval/Meshes/SM_Guard_Tower")
+    assert catalog.resolve("guard tower")["name"] == "SM_Guard_Tower"
+    assert "/Game/Medieval/Meshes/SM_Watchtower" not in catalog
+
+    # Updating a record keeps aliases that point at it
+    registry.add(make_record("/Game/Medieval/Meshes/SM_House_Small", tags=["medieval", "cottage"]))
+    assert catalog.resolve("house_small")["name"] == "SM_House_Small"
+    assert catalog.resolve("cottage")["name"] == "SM_House_Small"
+
+    # A registry without events is synced by diffing
+    other = AssetCatalog()
+    other.scan(registry)
+    registry.remove("/Game/Props/SM_HouseSmall_Ruined")
+    registry.add(make_record("/Game/Medieval/Meshes/SM_Well"))
+    stats = other.refresh(registry)
+    assert stats == {"added": 1, "removed": 1, "updated": 0}
+    assert other.resolve("well") is not None
+
+
+def test_index_persists_and_reloads(tmp_path):
+    catalog = AssetCatalog()
+    catalog.scan(_registry())
+    catalog.add_alias("house_small", "/Game/Medieval/Meshes/SM_House_Small")
+    index_path = str(tmp_path / "Saved" / "asset_index.json")
+    catalog.save(index_path)
+
+    loaded = AssetCatalog.load(index_path)
+    assert len(loaded) == len(catalog)
+    assert loaded.resolve("house_small")["name"] == "SM_House_Small"
+    assert loaded.resolve("small house")["name"] == "SM_House_Small"
+    # Derived indexes are restored, not rebuilt
+    assert loaded.resolve("hou lar")["name"] == "SM_House_Large"
+    assert loaded.resolve("blaksmith")["name"] == "SM_Blacksmith"
+    assert loaded._token_index == catalog._token_index
+    assert loaded._trigram_index == catalog._trigram_index
+    loaded.remove_asset("/Game/Medieval/Meshes/SM_House_Small")
+    assert "house_small" not in loaded.aliases and "/Game/Medieval/Meshes/SM_House_Small" not in loaded._token_index["house"]
+
+
+def test_lookup_stays_fast_with_100k_assets():
+    words = ["house", "tower", "wall", "gate", "barn", "mill", "well", "cart", "fence", "bridge",
+             "tavern", "church", "forge", "stable", "market", "keep", "hut", "shrine", "dock", "inn"]
+    sizes = ["small", "large", "tall", "ruined", "wide"]
+    records = [
+        make_record(f"/Game/Gen/Set{i % 100}/SM_{words[i % 20].title()}_{sizes[(i // 20) % 5].title()}_{i}")
+        for i in range(100000)
+    ]
+    catalog = AssetCatalog()
+    catalog.scan(MockAssetRegistry(records))
+    assert len(catalog) == 100000
+
+    # None of these is an exact name or token set: they go through the prefix and trigram stages
+    expected = {
+        "small house": "SM_House_Small_0",
+        "tavern": "SM_Tavern_Tall_50",
+        "hou sma": "SM_House_Small_0",
+        "smal hous": "SM_House_Small_0",
+        "tav": "SM_Tavern_Tall_50",
+        "tavren": None,
+        "zzz": None,
+    }
+    for q, name in expected.items():  # first lookup of a token sorts its postings once
+        hit = catalog.resolve(q)
+        assert (hit and hit["name"]) == name
+
+    queries = list(expected) * 300
+    start = time.perf_counter()
+    for q in queries:
+        catalog.resolve(q)
+    per_lookup = (time.perf_counter() - start) / len(queries)
+    assert per_lookup < 0.0002
+
+
+def test_skill_falls_back_to_catalog(monkeypatch):
+    from skills.medieval_builder.skill import MedievalBuilderSkill
+
+    catalog = AssetCatalog()
+    catalog.scan(_registry())
+    monkeypatch.setattr(asset_catalog, "_project_catalog", catalog)
+
+    base = os.path.dirname(os.path.dirname(__file__))
+    skill = MedievalBuilderSkill(os.path.join(base, "skills", "medieval_builder", "config.json"))
+
+    res = skill.run(building_type="large house", location=[0, 0, 0])
+    assert res["status"] in ("mock_success", "success")
+    assert "SM_House_Large" in res["msg"]
+
+    res = skill.run(building_type="spaceship", location=[0, 0, 0])
+    assert res["status"] == "error"
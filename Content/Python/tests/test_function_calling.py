@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.llm import DeepseekClient, build_tool_schemas, parse_tool_calls
+from tests.fake_agent import FakeLLM, make_agent
+from tests.stub_llm_server import StubLLMServer, tool_call_reply
+
+
+TOOL_DEF = {
+    "name": "spawn_medieval_building",
+    "description": "在指定位置生成中世纪建筑。",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "building_type": {"type": "string"},
+            "location": {"type": "array", "items": {"type": "number"}},
+        },
+        "required": ["building_type", "location"],
+    },
+    "examples": [{"building_type": "blacksmith", "location": [0, 0, 0]}],
+}
+
+
+def test_build_tool_schemas_from_registry_and_list():
+    from_map = build_tool_schemas({TOOL_DEF["name"]: TOOL_DEF})
+    from_list = build_tool_schemas([TOOL_DEF])
+    assert from_map == from_list
+    fn = from_map[0]["function"]
+    assert from_map[0]["type"] == "function"
+    assert fn["name"] == "spawn_medieval_building"
+    assert fn["parameters"]["required"] == ["building_type", "location"]
+    assert "examples" not in fn
+
+
+def test_parse_tool_calls_rejects_bad_arguments():
+    message = {"tool_calls": [{"id": "c0", "function": {"name": "t", "arguments": "{not json"}}]}
+    with pytest.raises(ValueError):
+        parse_tool_calls(message)
+
+
+def test_generate_tool_calls_parses_parallel_calls():
+    calls = [
+        ("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]}),
+        ("spawn_medieval_building", {"building_type": "watchtower", "location": [500, 0, 0]}),
+    ]
+    with StubLLMServer(lambda payload: tool_call_reply(calls)) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, model="stub")
+        client.register_tools([TOOL_DEF])
+        result = client.generate_tool_calls("sys", "建一个铁匠铺和一座哨塔")
+
+        # Tool schemas are sent via `tools`, not in the prompt
+        assert server.requests[0]["tools"] == client.tools
+
+    assert [c["tool"] for c in result["tool_calls"]] == ["spawn_medieval_building"] * 2
+    assert result["tool_calls"][1]["args"]["building_type"] == "watchtower"
+    assert client.last_usage["prompt_tokens"] > 0
+    assert client.last_latency is not None
+
+
+def test_native_mode_uses_fewer_prompt_tokens_than_prompt_mode():
+    base = os.path.dirname(os.path.dirname(__file__))
+    readme = open(os.path.join(base, "skills", "ue5_medieval_builder", "README.md"), encoding="utf-8").read()
+    tool_def = open(os.path.join(base, "skills", "ue5_medieval_builder", "tool_def.json"), encoding="utf-8").read()
+    legacy_prompt = "你是 UE5 助手。请根据以下工具定义，输出 JSON 指令。\n\n" + readme + tool_def
+
+    with StubLLMServer() as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, model="stub")
+        client.register_tools([TOOL_DEF])
+
+        client.generate(legacy_prompt, "建一个铁匠铺")
+        prompt_mode_tokens = client.last_usage["prompt_tokens"]
+
+        client.generate_tool_calls("你是 UE5 助手。请调用合适的工具完成用户指令。", "建一个铁匠铺")
+        native_tokens = client.last_usage["prompt_tokens"]
+
+    assert native_tokens < prompt_mode_tokens
+
+
+def test_agent_dispatches_each_parallel_call(monkeypatch):
+    agent, executed = make_agent(monkeypatch)
+    agent.llm = FakeLLM(agent, [
+        ("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]}),
+        ("spawn_medieval_building", {"building_type": "house_small", "location": [300, 0, 0]}),
+    ])
+    agent.run("建一个铁匠铺和一座小房子")
+
+    assert "README" not in agent.llm.requests[0]["system_prompt"]
+    assert [kw["building_type"] for kw in executed] == ["blacksmith", "house_small"]
@@ -0,0 +1,172 @@
+import json
+import os
+import sys
+import threading
+import time
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.idempotency import ToolCallGuard, idempotency_key
+from agent_core.skill_manager import SkillManager
+from tests.fake_agent import FakeLLM, make_agent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_arg_order_and_number_formatting():
+    a = idempotency_key("spawn", {"building_type": "blacksmith", "location": [0, 0, 0], "rotation_yaw": 90})
+    b = idempotency_key("spawn", {"rotation_yaw": 90.0, "location": (0.0, 0, 0), "building_type": " blacksmith"})
+    assert a == b
+    assert a != idempotency_key("spawn", {"building_type": "blacksmith", "location": [0, 0, 0], "rotation_yaw": 90}, "s2")
+    assert a != idempotency_key("spawn", {"building_type": "blacksmith", "location": [1, 0, 0], "rotation_yaw": 90})
+
+
+def test_duplicates_are_suppressed_within_window_only():
+    clock = FakeClock()
+    guard = ToolCallGuard(dedupe_window=5.0, clock=clock)
+    runs = []
+
+    def spawn():
+        runs.append(1)
+        return f"spawned #{len(runs)}"
+
+    args = {"building_type": "blacksmith", "location": [0, 0, 0]}
+    assert guard.execute("spawn", args, spawn, session_id="s1") == "spawned #1"
+    clock.now = 4.0
+    assert guard.execute("spawn", dict(args), spawn, session_id="s1") == "spawned #1"
+    assert guard.execute("spawn", args, spawn, session_id="s2") == "spawned #2"  # other session
+    clock.now = 10.0
+    assert guard.execute("spawn", args, spawn, session_id="s1") == "spawned #3"
+    assert guard.stats["duplicates_suppressed"] == 1 and guard.stats["executed"] == 3
+
+    # Failures are never recorded, so a retry runs again
+    errors = []
+    fail = lambda: errors.append(1) or {"status": "error", "msg": "boom"}
+    guard.execute("spawn", {"building_type": "x"}, fail)
+    guard.execute("spawn", {"building_type": "x"}, fail)
+    assert len(errors) == 2
+
+
+def test_overlapping_identical_calls_execute_once():
+    guard = ToolCallGuard(dedupe_window=5.0)
+    runs = []
+
+    def slow_spawn():
+        runs.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return "spawned"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            guard.execute("spawn", {"building_type": "blacksmith"}, slow_spawn, session_id="s1")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(runs) == 1
+    assert results == ["spawned"] * 4
+    assert guard.stats["duplicates_suppressed"] == 3
+
+    # If the running call fails, a waiting duplicate runs it instead
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        time.sleep(0.05)
+        if len(attempts) == 1:
+            raise RuntimeError("editor busy")
+        return "spawned"
+
+    errors = []
+
+    def call():
+        try:
+            results.append(guard.execute("spawn", {"building_type": "well"}, flaky))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(attempts) == 2 and len(errors) == 1
+
+
+def test_pure_results_are_memoized_in_bounded_lru():
+    guard = ToolCallGuard(dedupe_window=0, memo_size=2)
+    runs = []
+
+    def measure(name):
+        return lambda: runs.append(name) or len(name)
+
+    for name in ["a", "bb", "a", "ccc", "bb", "a"]:
+        guard.execute("measure", {"name": name}, measure(name), session_id=name, pure=True)
+
+    # "a" stays hot; "bb" is evicted by "ccc" and recomputed
+    assert runs == ["a", "bb", "ccc", "bb", "a"]
+    assert guard.stats["cache_hits"] == 1 and guard.stats["cache_misses"] == 5
+
+
+def test_skill_manager_dedupes_and_memoizes_pure_tools(tmp_path):
+    skill_dir = tmp_path / "area_calc"
+    skill_dir.mkdir()
+    (skill_dir / "tool_def.json").write_text(json.dumps({"tools": [
+        {"name": "footprint_area", "pure": True, "parameters": {"type": "object", "properties": {"size": {"type": "array"}}}},
+    ]}), encoding="utf-8")
+    (skill_dir / "skill.py").write_text(
+        "from agent_core.base_tool import BaseTool\n"
+        "CALLS = []\n"
+        "class AreaSkill(BaseTool):\n"
+        "    def run(self, size):\n"
+        "        CALLS.append(size)\n"
+        "        return {'status': 'success', 'area': size[0] * size[1]}\n",
+        encoding="utf-8")
+
+    sm = SkillManager(str(tmp_path))
+    assert sm.pure_tools == {"footprint_area"}
+    first = sm.execute_tool("footprint_area", session_id="s1", size=[4, 5])
+    second = sm.execute_tool("footprint_area", session_id="s2", size=[4.0, 5.0])
+    assert first == second == {"status": "success", "area": 20}
+    assert sm.guard.stats["cache_hits"] == 1
+
+    base = os.path.dirname(os.path.dirname(__file__))
+    medieval = SkillManager(os.path.join(base, "skills"))
+    assert "spawn_medieval_building" not in medieval.pure_tools
+    medieval.execute_tool("spawn_medieval_building", session_id="s1", building_type="blacksmith", location=[0, 0, 0])
+    medieval.execute_tool("spawn_medieval_building", session_id="s1", building_type="blacksmith", location=[0, 0, 0])
+    assert medieval.guard.stats["duplicates_suppressed"] == 1
+
+
+def test_agent_runs_repeated_llm_tool_call_once(monkeypatch):
+    agent, spawned = make_agent(monkeypatch)
+    call = ("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]})
+    # The model repeats the same call within one response
+    agent.llm = FakeLLM(agent, [call, call])
+    agent.run("建一个铁匠铺", session_id="designer-1")
+    agent.run("建一个铁匠铺", session_id="designer-1")  # re-sent instruction
+    agent.run("建一个铁匠铺", session_id="designer-2")
+
+    assert len(spawned) == 2
+    assert agent.tool_guard.stats["duplicates_suppressed"] == 4
+
+    # Suppressed repeats are noted but never recorded as a second executed action
+    session = agent.sessions.get("designer-1")
+    assert len(session.recent_actions) == 1
+    executed = [m["content"] for m in session.messages() if m["content"].startswith("已执行")]
+    skipped = [m["content"] for m in session.messages() if m["content"].startswith("未执行")]
+    assert len(executed) == 1 and len(skipped) == 3
+    assert all("重复调用" in text for text in skipped)
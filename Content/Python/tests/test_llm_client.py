@@ -15,7 +15,7 @@ def test_deepseek_client_with_openai_sdk(monkeypatch):
     module = types.ModuleType("openai")
 
     class FakeOpenAI:
-        def __init__(self, api_key=None, base_url=None):
+        def __init__(self, api_key=None, base_url=None, **kwargs):
             self.chat = types.SimpleNamespace(
                 completions=types.SimpleNamespace(
                     create=lambda **kwargs: types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content="sdk response"))])
@@ -31,9 +31,8 @@ def test_deepseek_client_with_openai_sdk(monkeypatch):
 
 
 def test_deepseek_client_requests_fallback(monkeypatch):
-    # Remove openai if present
-    if "openai" in sys.modules:
-        del sys.modules["openai"]
+    # Make openai unavailable (None in sys.modules blocks the import)
+    monkeypatch.setitem(sys.modules, "openai", None)
 
     class FakeResponse:
         def __init__(self):
@@ -0,0 +1,186 @@
+import os
+import random
+import sys
+import time
+
+import pytest
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.llm import DeepseekClient
+from agent_core.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay
+from tests.stub_llm_server import StubHTTPError, StubLLMServer, text_reply
+
+
+def test_latency_tracker_percentile_and_backoff_jitter():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000.0)
+    assert tracker.percentile(95) == pytest.approx(0.095)
+
+    rng = random.Random(0)
+    delays = [backoff_delay(3, base=0.1, cap=0.5, rng=rng) for _ in range(50)]
+    assert all(0 <= d <= 0.5 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_failure()  # failed probe re-opens
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 20.0
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retries_transient_errors_with_backoff():
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            raise StubHTTPError(503)
+        return text_reply("ok")
+
+    with StubLLMServer(flaky) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, max_retries=2, backoff_base=0.01, hedge=False)
+        assert client.generate("sys", "user") == "ok"
+
+    assert len(calls) == 3
+    assert client.stats["retries"] == 2
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def bad_request(payload):
+        calls.append(payload)
+        raise StubHTTPError(400)
+
+    with StubLLMServer(bad_request) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, max_retries=3, backoff_base=0.01, hedge=False)
+        with pytest.raises(Exception):
+            client.generate("sys", "user")
+
+    assert len(calls) == 1
+    assert client.endpoints[0].breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_beats_slow_primary():
+    def slow(payload):
+        time.sleep(1.0)
+        return text_reply("slow")
+
+    with StubLLMServer(slow) as slow_server, StubLLMServer(lambda p: text_reply("fast")) as fast_server:
+        client = DeepseekClient(api_key="fake", base_urls=[slow_server.url, fast_server.url], hedge_delay=0.05, max_retries=0)
+        # Pretend the slow endpoint has been fastest so far so it is picked as primary
+        client.endpoints[0].latency.record(0.001)
+        client.endpoints[1].latency.record(0.002)
+
+        start = time.perf_counter()
+        assert client.generate("sys", "user") == "fast"
+        assert time.perf_counter() - start < 0.8
+
+    assert client.stats["hedges"] == 1
+    assert client.stats["hedge_wins"] == 1
+
+
+def test_circuit_breaker_fails_fast_when_upstream_unhealthy():
+    calls = []
+
+    def down(payload):
+        calls.append(payload)
+        raise StubHTTPError(500)
+
+    with StubLLMServer(down) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, max_retries=1, backoff_base=0.01, hedge=False,
+                                breaker_threshold=2, breaker_reset=60)
+        with pytest.raises(Exception):
+            client.generate("sys", "user")
+        seen = len(calls)
+
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            client.generate("sys", "user")
+        assert time.perf_counter() - start < 0.05
+
+    assert len(calls) == seen == 2
+
+
+def test_latency_aware_selection_prefers_faster_endpoint():
+    def slow(payload):
+        time.sleep(0.05)
+        return text_reply("slow")
+
+    with StubLLMServer(slow) as slow_server, StubLLMServer(lambda p: text_reply("fast")) as fast_server:
+        client = DeepseekClient(api_key="fake", base_urls=[slow_server.url, fast_server.url], hedge=False)
+        answers = [client.generate("sys", "user") for _ in range(5)]
+
+    # Both are probed once, then the faster one is preferred
+    assert answers[2:] == ["fast"] * 3
+    assert client._select_endpoints()[0].base_url == fast_server.url
+
+
+def test_fast_failing_endpoint_is_not_ranked_fastest():
+    failing_calls = []
+
+    def healthy(payload):
+        time.sleep(0.05)
+        return text_reply("ok")
+
+    def broken(payload):
+        failing_calls.append(payload)
+        raise StubHTTPError(503)
+
+    with StubLLMServer(healthy) as healthy_server, StubLLMServer(broken) as broken_server:
+        client = DeepseekClient(api_key="fake", base_urls=[healthy_server.url, broken_server.url],
+                                max_retries=2, backoff_base=0.01, hedge=False)
+        answers = [client.generate("sys", "user") for _ in range(3)]
+
+    assert answers == ["ok"] * 3
+    # The broken endpoint is tried once as an untried candidate, then never picked first again
+    assert len(failing_calls) == 1
+    assert len(client.endpoints[1].latency) == 0
+    assert client._select_endpoints()[0].base_url == healthy_server.url
+
+
+def test_hung_primary_does_not_stall_later_calls():
+    hung_calls = []
+
+    def hung(payload):
+        hung_calls.append(payload)
+        time.sleep(1.5)
+        return text_reply("slow")
+
+    with StubLLMServer(hung) as hung_server, StubLLMServer(lambda p: text_reply("fast")) as fast_server:
+        client = DeepseekClient(api_key="fake", base_urls=[hung_server.url, fast_server.url], hedge_delay=0.05, max_retries=0)
+        client.endpoints[0].latency.record(0.001)
+        client.endpoints[1].latency.record(0.002)
+
+        # The running attempt counts against the hung endpoint, so it is not picked again
+        start = time.perf_counter()
+        assert [client.generate("sys", "user") for _ in range(6)] == ["fast"] * 6
+        assert time.perf_counter() - start < 1.0
+        assert len(hung_calls) == 1
+
+        # Even when the hung endpoint keeps being the primary, abandoned attempts never
+        # hold up the next call's hedge
+        client._select_endpoints = lambda: list(client.endpoints)
+        for _ in range(6):
+            start = time.perf_counter()
+            assert client.generate("sys", "user") == "fast"
+            assert time.perf_counter() - start < 0.5
+
+    assert client.stats["hedges"] == 7
@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core import prefetch, ue_bridge
+from agent_core.llm import DeepseekClient
+from agent_core.prefetch import AssetPrefetcher
+from tests.fake_agent import make_agent
+from tests.stub_llm_server import StubLLMServer, text_reply, tool_call_reply
+
+CATALOG = {"blacksmith": "/Game/Medieval/Meshes/SM_Blacksmith", "watchtower": "/Game/Medieval/Meshes/SM_Watchtower"}
+
+
+def test_prefetch_starts_when_key_completes_across_fragments():
+    loaded = []
+    prefetcher = AssetPrefetcher(CATALOG.get, loader=lambda path: loaded.append(path) or f"mesh:{path}")
+
+    for fragment in ['{"building_', 'type": "black', 'smith"', ', "location": [0, 0, 0]}']:
+        prefetcher.feed(fragment)
+        if fragment == 'type": "black':
+            assert loaded == []  # value not complete yet
+    prefetcher.feed('{"building_type": "blacksmith"}{"building_type": "spaceship"}')
+
+    assert loaded == ["/Game/Medieval/Meshes/SM_Blacksmith"]
+    assert prefetcher.take("/Game/Medieval/Meshes/SM_Blacksmith") == "mesh:/Game/Medieval/Meshes/SM_Blacksmith"
+    assert prefetcher.take("/Game/Medieval/Meshes/SM_Blacksmith") is None
+    assert prefetcher.metrics()["used"] == 1
+
+
+def test_queue_is_bounded_and_unused_prefetches_are_discarded():
+    prefetcher = AssetPrefetcher(CATALOG.get, loader=lambda path: object(), max_pending=1)
+    prefetcher.schedule("/Game/A")
+    prefetcher.schedule("/Game/B")
+    assert prefetcher.stats["dropped"] == 1
+
+    # A spawn that needs a queued asset cancels the speculative load and loads it itself
+    assert prefetcher.take("/Game/A") is None
+    prefetcher.pump()
+    assert prefetcher.stats["loaded"] == 0
+
+    with prefetch.activate(prefetcher):
+        prefetcher.feed('"building_type": "watchtower"')
+        assert prefetcher.stats["loaded"] == 1
+    m = prefetcher.metrics()
+    assert m["discarded"] == 1 and m["used"] == 0
+    assert prefetch.take("/Game/Medieval/Meshes/SM_Watchtower") is None
+
+
+def test_prefetch_hides_load_latency_of_streamed_spawn(monkeypatch):
+    load_seconds = 0.05
+
+    def slow_load(path):
+        time.sleep(load_seconds)
+        return f"mesh:{path}"
+
+    monkeypatch.setattr(ue_bridge, "load_asset_now", slow_load)
+
+    agent, _ = make_agent(monkeypatch)
+    spawn_load_times = []
+
+    def spawn(building_type, location, rotation_yaw=0):
+        start = time.perf_counter()
+        mesh = ue_bridge.load_asset(CATALOG[building_type])
+        spawn_load_times.append(time.perf_counter() - start)
+        return f"spawned {mesh}"
+
+    agent.registry.skills["spawn_medieval_building"] = spawn
+    agent._resolve_asset_path = CATALOG.get
+
+    calls = [
+        ("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0], "rotation_yaw": 90}),
+        ("spawn_medieval_building", {"building_type": "watchtower", "location": [500, 0, 0], "rotation_yaw": 0}),
+    ]
+    with StubLLMServer(lambda p: tool_call_reply(calls), stream_chunk_chars=6, stream_delay=0.005) as server:
+        agent.llm = DeepseekClient(api_key="fake", base_url=server.url)
+        agent.llm.register_tools(agent.registry.tool_defs)
+        agent.run("在原点建铁匠铺，旁边建一座哨塔")
+        assert server.requests[0]["stream"] is True
+
+    assert len(spawn_load_times) == 2
+    assert max(spawn_load_times) < load_seconds / 2
+    assert agent.prefetch_metrics["used"] == 2
+    assert agent.prefetch_metrics["hidden_ms"] >= 2 * load_seconds * 1000 * 0.9
+
+
+def test_prefetch_errors_never_fail_the_request(monkeypatch):
+    agent, spawned = make_agent(monkeypatch)
+
+    def broken_resolver(building_type):
+        raise RuntimeError("registry unavailable")
+
+    agent._resolve_asset_path = broken_resolver
+    calls = [("spawn_medieval_building", {"building_type": "watchtower", "location": [0, 0, 0]})]
+    with StubLLMServer(lambda p: tool_call_reply(calls)) as server:
+        agent.llm = DeepseekClient(api_key="fake", base_url=server.url)
+        agent.llm.register_tools(agent.registry.tool_defs)
+        agent.run("在原点建一座哨塔")
+
+    # The real LLM answer was used, not the mock fallback
+    assert spawned == [{"building_type": "watchtower", "location": [0, 0, 0]}]
+    assert agent.prefetch_metrics["errors"] == 1
+
+    prefetcher = AssetPrefetcher(CATALOG.get, loader=lambda path: 1 / 0)
+    prefetcher.feed('"building_type": "blacksmith"')
+    assert prefetcher.stats["errors"] == 1 and prefetcher.stats["loaded"] == 0
+
+
+def test_streamed_agent_request_is_still_hedged(monkeypatch):
+    agent, spawned = make_agent(monkeypatch)
+    agent._resolve_asset_path = CATALOG.get
+    calls = [("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]})]
+
+    def slow(payload):
+        time.sleep(1.0)
+        return tool_call_reply(calls)
+
+    with StubLLMServer(slow) as slow_server, StubLLMServer(lambda p: tool_call_reply(calls)) as fast_server:
+        agent.llm = DeepseekClient(api_key="fake", base_urls=[slow_server.url, fast_server.url], hedge_delay=0.05)
+        agent.llm.register_tools(agent.registry.tool_defs)
+        # Pretend the slow endpoint has been fastest so far so it is picked as primary
+        agent.llm.endpoints[0].latency.record(0.001)
+        agent.llm.endpoints[1].latency.record(0.002)
+
+        start = time.perf_counter()
+        agent.run("在原点建铁匠铺")
+        elapsed = time.perf_counter() - start
+        assert fast_server.requests[0]["stream"] is True
+
+    assert elapsed < 0.8
+    assert agent.llm.stats["hedges"] == 1 and agent.llm.stats["hedge_wins"] == 1
+    assert len(spawned) == 1
+
+
+def test_stream_hedge_deadline_uses_time_to_first_fragment():
+    reply = text_reply("好的，" * 20)
+    with StubLLMServer(lambda p: reply, stream_delay=0.02) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, hedge_min_samples=1)
+        client.generate("sys", "user", stream=True)
+    endpoint = client.endpoints[0]
+    assert endpoint.first_fragment.percentile(95) < endpoint.latency.percentile(95) / 3
+    assert client._hedge_deadline(endpoint, stream=True) == endpoint.first_fragment.percentile(95)
+
+    # Full responses take seconds but the first fragment normally arrives at once: a primary
+    # that is silent for 1s gets hedged long before its full-response p95
+    def silent(payload):
+        time.sleep(1.0)
+        return reply
+
+    with StubLLMServer(silent) as slow_server, StubLLMServer(lambda p: reply) as fast_server:
+        client = DeepseekClient(api_key="fake", base_urls=[slow_server.url, fast_server.url])
+        slow, fast = client.endpoints
+        for _ in range(client.hedge_min_samples):
+            slow.latency.record(2.0)
+            slow.first_fragment.record(0.05)
+            fast.latency.record(3.0)
+
+        start = time.perf_counter()
+        client.generate("sys", "user", stream=True)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.8
+    assert client.stats["hedges"] == 1 and client.stats["hedge_wins"] == 1
+
+
+def test_stream_latency_excludes_prefetch_work():
+    with StubLLMServer(lambda p: tool_call_reply([("spawn_medieval_building", {"building_type": "blacksmith"})])) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url)
+        client.register_tools([{"name": "spawn_medieval_building", "parameters": {}}])
+        client.generate_tool_calls("sys", "user", on_delta=lambda text: time.sleep(0.05))
+
+    # The callback slept for every fragment, but only network time is sampled for the endpoint
+    assert client.last_latency > 0.2
+    assert client.endpoints[0].latency.ewma < client.last_latency / 2
@@ -0,0 +1,124 @@
+import os
+import sys
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.llm import DeepseekClient
+from agent_core.session import ConversationSession, SessionStore, estimate_tokens
+from tests.fake_agent import FakeLLM, make_agent
+from tests.stub_llm_server import StubLLMServer, text_reply
+
+
+def _recount(session):
+    turns = sum(estimate_tokens(m["content"]) + session.MESSAGE_OVERHEAD for m, _ in session.turns)
+    summary = sum(estimate_tokens(line) for line, _ in session.summary)
+    return turns + summary + session.state_tokens
+
+
+def test_session_stays_under_budget_over_hundreds_of_turns():
+    session = ConversationSession("s1", token_budget=600)
+    sizes = []
+    for i in range(500):
+        session.add_user(f"在 ({i * 100}, 0, 0) 放一个铁匠铺，朝向 {i % 360} 度")
+        session.add_tool_result("spawn_medieval_building", {"building_type": "blacksmith", "location": [i * 100, 0, 0]}, "Success")
+        sizes.append(session.total_tokens)
+
+    assert max(sizes) <= 600
+    # Running totals match a full recount
+    assert session.total_tokens == _recount(session)
+    # Memory is bounded, not proportional to the number of turns
+    assert len(session.turns) + len(session.summary) < 60
+    assert session.turn_count == 500
+
+
+def test_structured_state_survives_compaction():
+    session = ConversationSession("s1", token_budget=200, min_recent=2)
+    session.add_user("建一个铁匠铺")
+    session.add_tool_result("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]}, "Success")
+    for i in range(50):
+        session.add_user(f"闲聊 {i}")
+        session.add_assistant("好的")
+
+    memory = session.messages()[0]
+    assert memory["role"] == "system"
+    assert '"building_type": "blacksmith"' in memory["content"]
+
+
+def test_session_store_evicts_least_recently_used():
+    store = SessionStore(max_sessions=2)
+    a = store.get("a")
+    store.get("b")
+    assert store.get("a") is a
+    store.get("c")
+    assert len(store) == 2
+    assert store.get("a") is a
+    assert "b" not in store._sessions
+
+
+def test_history_is_sent_between_system_prompt_and_input():
+    session = ConversationSession("s1")
+    session.add_user("建一个铁匠铺")
+    session.add_tool_result("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]}, "Success")
+
+    with StubLLMServer(lambda p: text_reply("ok")) as server:
+        client = DeepseekClient(api_key="fake", base_url=server.url, hedge=False)
+        client.generate("sys", "把它往北移动 10 米", history=session.messages())
+        messages = server.requests[0]["messages"]
+
+    assert messages[0] == {"role": "system", "content": "sys"}
+    assert messages[-1] == {"role": "user", "content": "把它往北移动 10 米"}
+    assert any("blacksmith" in m["content"] for m in messages[1:-1])
+
+
+def test_agent_records_turns_per_session(monkeypatch):
+    agent, _ = make_agent(monkeypatch)
+    agent.llm = FakeLLM(agent, [("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]})])
+    agent.run("建一个铁匠铺", session_id="designer-1")
+    agent.run("再加三个", session_id="designer-1")
+    agent.run("建一个铁匠铺", session_id="designer-2")
+    seen_history = [r["history"] for r in agent.llm.requests]
+
+    assert seen_history[0] == []
+    assert any("已执行 spawn_medieval_building" in m["content"] for m in seen_history[1])
+    assert seen_history[2] == []
+
+
+def test_budget_holds_when_recent_turns_are_long():
+    session = ConversationSession("s1", token_budget=200)
+    for i in range(5):
+        session.add_user(f"第{i}条：" + "很长的建造说明" * 85 + "END")
+        assert session.total_tokens <= 200
+        assert session.total_tokens == _recount(session)
+
+    # The newest message keeps its beginning; older ones give way first
+    newest = session.turns[-1][0]["content"]
+    assert newest.startswith("第4条")
+    assert len(session.turns) <= session.min_recent
+
+    session.add_tool_result("spawn_medieval_building", {"building_type": "x" * 2000, "location": [0, 0, 0]}, "Success")
+    assert session.total_tokens <= 200
+
+
+def test_only_successful_calls_become_session_actions(monkeypatch):
+    agent, spawned = make_agent(monkeypatch)
+    agent.llm = FakeLLM(agent, [
+        ("spawn_medieval_building", {"building_type": "blacksmith", "location": [0, 0, 0]}),
+        ("spawn_medieval_building", {"building_type": "watchtower", "location": [0, 0]}),  # fails validation
+        ("nope", {}),  # unknown tool
+    ])
+    agent.run("建一个铁匠铺和一座哨塔", session_id="s1")
+    agent.registry.skills["spawn_medieval_building"] = lambda **kw: "Error: Asset not found at /Game/Missing"
+    agent.llm.calls = [("spawn_medieval_building", {"building_type": "well", "location": [9, 9, 9]})]
+    agent.run("再建一口井", session_id="s1")
+
+    session = agent.sessions.get("s1")
+    assert [a["args"]["building_type"] for a in session.recent_actions] == ["blacksmith"]
+    notes = [m["content"] for m, _ in session.turns if m["role"] == "assistant"]
+    assert sum(n.startswith("已执行") for n in notes) == 1
+    assert any(n.startswith("未执行 nope") and "未找到工具" in n for n in notes)
+    assert any(n.startswith("未执行 spawn_medieval_building") and "参数校验失败" in n for n in notes)
+    assert any("Asset not found" in n and n.startswith("未执行") for n in notes)
+    assert "None" not in " ".join(notes)
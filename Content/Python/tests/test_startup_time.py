@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Ensure Content/Python is on sys.path for tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agent_core.import_profiler import discover_targets, profile_module
+
+# Generous enough for slow CI runners; importing openai or pydantic alone costs several times this.
+STARTUP_BUDGET_MS = float(os.environ.get("AGENT_STARTUP_BUDGET_MS", "150"))
+
+
+@pytest.mark.parametrize("module", discover_targets())
+def test_module_imports_within_budget_without_heavy_deps(module):
+    result = profile_module(module)
+    assert result["error"] is None, result["error"]
+    assert result["heavy_loaded"] == [], f"{module} eagerly imports {result['heavy_loaded']}"
+    assert result["cumulative_us"] / 1000 < STARTUP_BUDGET_MS, result